@@ -20,8 +20,70 @@
 
 from __future__ import division, absolute_import, print_function
 
+import sys as _sys
+from importlib import import_module as _import_module
+
 from .system import *
-from .window import *
-from .graphics import *
-#from .audio import *
-#from .network import *
+
+
+# Everything else is imported on first use, so that e.g. a headless server that
+# only touches networking never declares or loads the graphics libraries.
+_lazy_names = {
+    'window': ['Style', 'ContextSettings', 'GlResource', 'Window', 'VideoMode', 'Context',
+               'Keyboard', 'Mouse', 'Joystick', 'Event', 'CloseEvent', 'SizeEvent', 'ResizeEvent',
+               'FocusEvent', 'FocusGainEvent', 'FocusLossEvent', 'TextEvent', 'KeyEvent',
+               'KeyPressEvent', 'KeyReleaseEvent', 'MouseWheelEvent', 'MouseButtonEvent',
+               'MouseButtonPressEvent', 'MouseButtonReleaseEvent', 'MouseMoveEvent', 'MouseEvent',
+               'MouseEnterEvent', 'MouseLeaveEvent', 'JoystickButtonEvent',
+               'JoystickButtonPressEvent', 'JoystickButtonReleaseEvent', 'JoystickMoveEvent',
+               'JoystickConnectEvent', 'JoystickConnectConnectEvent',
+               'JoystickConnectDisconnectEvent'],
+    'graphics': ['Pixels', 'Rect', 'Rectangle', 'BlendMode', 'PrimitiveType', 'Color', 'Transform',
+                 'Transformable', 'Drawable', 'TransformableDrawable', 'Sprite', 'Font', 'Image',
+                 'Texture', 'Shader', 'RenderTarget', 'RenderStates', 'RenderWindow', 'Text',
+                 'VertexArray', 'View', 'Glyph', 'Vertex', 'vertex_dtype', 'Shape', 'CircleShape',
+                 'RectangleShape', 'ConvexShape', 'SpriteBatch', 'StaticLayer', 'TextBatch',
+                 'TextureAtlas'],
+    'audio': ['Listener', 'SoundSource', 'SoundStream', 'Music', 'Sound', 'SoundBuffer',
+              'SoundRecorder', 'SoundBufferRecorder'],
+    'network': ['IpAddress', 'FtpDirectoryResponse', 'FtpListingResponse', 'FtpResponse', 'Ftp',
+                'HttpRequest', 'HttpResponse', 'Http', 'Packet', 'SocketSelector', 'TcpListener',
+                'TcpSocket', 'UdpSocket', 'FtpTransferMode', 'FtpStatus', 'HttpMethod', 'HttpStatus',
+                'SocketStatus'],
+}
+_lazy_modules = ['window', 'graphics', 'audio', 'network']
+
+# What `from pycsfml.all import *` gives, going through __getattr__. Audio and
+# network are left out, so that it doesn't load their libraries.
+__all__ = [
+    'Time', 'seconds', 'milliseconds', 'microseconds', 'Clock', 'Mutex', 'Lock', 'Thread',
+    'ThreadLocal', 'sleep', 'Vector2', 'Vector3',
+]+_lazy_names['window']+_lazy_names['graphics']
+
+def _import(module_name):
+    module = _import_module('.'+module_name, __package__)
+    names = getattr(module, '__all__', None)
+    if names is None:
+        names = [k for k in vars(module) if not k.startswith('_')]
+    globals().update((k, getattr(module, k)) for k in names)
+    globals()[module_name] = module
+    return module
+
+def __getattr__(name):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    if name in _lazy_modules:
+        return _import(name)
+    for module_name, names in _lazy_names.items():
+        if name in names:
+            return getattr(_import(module_name), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_modules) | {n for names in _lazy_names.values() for n in names})
+
+
+# Module-level __getattr__ needs Python 3.7
+if _sys.version_info < (3, 7):
+    _import('window')
+    _import('graphics')
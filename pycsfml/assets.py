@@ -0,0 +1,230 @@
+# PyCSFML - Python bindings for SFML
+# Copyright (c) 2014, Oleh Prypin <blaxpirit@gmail.com>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty. In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+
+
+
+from __future__ import division, absolute_import, print_function
+
+import collections as _collections
+import hashlib as _hashlib
+import os as _os
+import sys as _sys
+import threading as _threading
+from concurrent import futures as _futures
+from timeit import default_timer as _timer
+
+__all__ = ['AssetLoader', 'ResourceCache']
+
+# Not available on PyPy, where evicted objects are then left to the GC
+_getrefcount = getattr(_sys, 'getrefcount', None)
+
+
+class AssetLoader(object):
+    # Loads assets without blocking the frame loop. Files are read and
+    # decoded into Image, Font and SoundBuffer objects on a thread pool;
+    # textures, which must be created on the render thread, are made from
+    # the decoded images by process_uploads(), to be called once per frame.
+    # Every load_* method returns a concurrent.futures.Future; wrap() turns it
+    # into an asyncio awaitable.
+    def __init__(self, max_workers=None, executor=None):
+        self._own_executor = executor is None
+        self._executor = executor or _futures.ThreadPoolExecutor(max_workers or 4)
+        # (Image, texture future, area, smooth) decoded and waiting for upload
+        self._uploads = _collections.deque()
+        self._lock = _threading.Lock()
+
+    def load_image(self, filename):
+        from .graphics import Image
+        return self._executor.submit(Image.from_file, filename)
+
+    def load_font(self, filename):
+        from .graphics import Font
+        return self._executor.submit(Font.from_file, filename)
+
+    def load_sound_buffer(self, filename):
+        from .audio import SoundBuffer
+        return self._executor.submit(SoundBuffer.from_file, filename)
+
+    def load_texture(self, filename, area=None, smooth=False):
+        result = _futures.Future()
+        def decoded(image_future):
+            try: image = image_future.result()
+            except BaseException as e:
+                if result.set_running_or_notify_cancel():
+                    result.set_exception(e)
+                return
+            self._uploads.append((image, result, area, smooth))
+        self.load_image(filename).add_done_callback(decoded)
+        return result
+
+    @property
+    def pending_uploads(self):
+        return len(self._uploads)
+
+    # Creates textures for decoded images until `budget` seconds have passed
+    # (at least one is always created, if any is waiting; None means no
+    # limit). Must be called on the render thread. -> number of textures
+    def process_uploads(self, budget=0.004):
+        from .graphics import Texture
+        start = _timer()
+        count = 0
+        with self._lock:
+            while self._uploads:
+                if count and budget is not None and _timer()-start>=budget:
+                    break
+                image, result, area, smooth = self._uploads.popleft()
+                if not result.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if area is None: texture = Texture.from_image(image)
+                    else: texture = Texture.from_image(image, area)
+                    if smooth: texture.smooth = True
+                except BaseException as e:
+                    result.set_exception(e)
+                else:
+                    result.set_result(texture)
+                count += 1
+        return count
+
+    @staticmethod
+    def wrap(future, loop=None):
+        import asyncio
+        return asyncio.wrap_future(future, loop=loop)
+
+    def shutdown(self, wait=True):
+        if self._own_executor:
+            self._executor.shutdown(wait)
+
+    def __enter__(self):
+        return self
+    def __exit__(self, typ, value, tb):
+        self.shutdown()
+
+
+class ResourceCache(object):
+    # Shares one Texture, Image, Font or SoundBuffer per file path (or per
+    # SHA-1 of the data for the *_from_memory methods) and keeps the total
+    # estimated size under `max_bytes` by evicting the least recently used
+    # entries. Evicted objects are freed once nothing else uses them; with
+    # destroy=True those only referenced by the cache are destroyed right away.
+    def __init__(self, max_bytes=256*1024*1024, destroy=False):
+        self.max_bytes = max_bytes
+        self.destroy = destroy
+        # key -> [object, bytes, data kept alive for the object]
+        self._entries = _collections.OrderedDict()
+        self._lock = _threading.RLock()
+        self.total_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _get(self, key, create, source=None):
+        with self._lock:
+            try:
+                entry = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            obj = create()
+            size = obj._sf_size()
+            self._entries[key] = [obj, size, source]
+            self.total_bytes += size
+            self._evict()
+            return obj
+
+    def _evict(self):
+        # The most recent entry stays even if it alone exceeds the budget
+        while self.total_bytes>self.max_bytes and len(self._entries)>1:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        obj, size, source = self._entries.pop(key)
+        self.total_bytes -= size
+        # Sprites, texts and sounds keep what they use referenced, so only
+        # `obj` and the argument of getrefcount are left if nothing does
+        if self.destroy and _getrefcount is not None and _getrefcount(obj)<=2:
+            obj.destroy()
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            while self._entries:
+                self._remove(next(iter(self._entries)))
+
+    def _file_key(self, kind, filename, *args):
+        return (kind, _os.path.abspath(filename))+args
+
+    def _memory_key(self, kind, data, *args):
+        return (kind, _hashlib.sha1(data).hexdigest())+args
+
+    def texture(self, filename, area=None):
+        from .graphics import Texture
+        key = self._file_key('Texture', filename, _rect_key(area))
+        if area is None: create = lambda: Texture.from_file(filename)
+        else: create = lambda: Texture.from_file(filename, area)
+        return self._get(key, create)
+
+    def image(self, filename):
+        from .graphics import Image
+        return self._get(self._file_key('Image', filename), lambda: Image.from_file(filename))
+
+    def font(self, filename):
+        from .graphics import Font
+        return self._get(self._file_key('Font', filename), lambda: Font.from_file(filename))
+
+    def sound_buffer(self, filename):
+        from .audio import SoundBuffer
+        return self._get(self._file_key('SoundBuffer', filename), lambda: SoundBuffer.from_file(filename))
+
+    def texture_from_memory(self, data, area=None):
+        from .graphics import Texture
+        key = self._memory_key('Texture', data, _rect_key(area))
+        if area is None: create = lambda: Texture.from_memory(data)
+        else: create = lambda: Texture.from_memory(data, area)
+        return self._get(key, create)
+
+    def image_from_memory(self, data):
+        from .graphics import Image
+        return self._get(self._memory_key('Image', data), lambda: Image.from_memory(data))
+
+    # CSFML reads fonts lazily from the given memory, which is kept alive here
+    def font_from_memory(self, data):
+        from .graphics import Font
+        return self._get(self._memory_key('Font', data), lambda: Font.from_memory(data), data)
+
+    def sound_buffer_from_memory(self, data):
+        from .audio import SoundBuffer
+        return self._get(self._memory_key('SoundBuffer', data), lambda: SoundBuffer.from_memory(data))
+
+def _rect_key(rect):
+    if rect is None:
+        return None
+    try: return rect.left, rect.top, rect.width, rect.height
+    except AttributeError: return tuple(rect)
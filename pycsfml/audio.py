@@ -20,13 +20,14 @@
 
 from __future__ import division, absolute_import, print_function
 
-from .ffi import ffi as _ffi
-_sf = _ffi.dlopen('libcsfml-audio.so')
+from .ffi import ffi as _ffi, load as _load
+_sf = _load('audio')
 
 from . import system as _system
 
 from . import base
 from .util import arg_error as _arg_error
+from .util import memory_buffer as _memory_buffer, map_file as _map_file
 
 
 
@@ -63,6 +64,7 @@ class Listener(base.SFMLClass):
     
 
 class SoundSource(object):
+    __slots__ = ()
     STOPPED = _sf.sfStopped
     PAUSED = _sf.sfPaused
     PLAYING = _sf.sfPlaying
@@ -72,19 +74,33 @@ class SoundStream(base.SFMLClass, SoundSource):
 
 
 class Music(SoundStream, base.SFMLClass):
+    __slots__ = ('_sf_source',)
+    _sf_destroy = _sf.sfMusic_destroy
     @classmethod
     def from_file(cls, filename):
         try: filename = filename.encode()
         except AttributeError: pass
         result = _sf.sfMusic_createFromFile(filename)
         if not result: raise IOError("Could not create Music from file {!r}".format(filename))
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
     
+    # `data` is any buffer; it is streamed from as long as the music lives
     @classmethod
-    def from_memory(cls, data, size_in_bytes):
-        result = _sf.sfMusic_createFromMemory(data, size_in_bytes)
+    def from_memory(cls, data, size_in_bytes=None):
+        data, size = _memory_buffer(data)
+        if size_in_bytes is not None:
+            if not 0<=size_in_bytes<=size:
+                raise ValueError("size_in_bytes {} is out of range for a buffer of {} bytes".format(size_in_bytes, size))
+            size = size_in_bytes
+        result = _sf.sfMusic_createFromMemory(data, size)
         if not result: raise IOError("Could not create Music from memory")
-        return cls._wrap_ptr(result)
+        result = cls._wrap_ptr(result, owned=True)
+        result._sf_source = data
+        return result
+
+    @classmethod
+    def from_mmap(cls, filename, offset=0, length=None):
+        return cls.from_memory(_map_file(filename, offset, length))
     
     #@classmethod
     #def from_stream(cls, stream):
@@ -94,9 +110,6 @@ class Music(SoundStream, base.SFMLClass):
         #if not result: raise IOError("Could not create Music from stream")
         #return cls._wrap_ptr(result)
     
-    def __del__(self):
-        if self._sf_owned: _sf.sfMusic_destroy(self._sfMusic)
-    
     def get_loop(self):
         return _sf.sfMusic_getLoop(self._sfMusic)
     def set_loop(self, loop):
@@ -180,17 +193,21 @@ class Music(SoundStream, base.SFMLClass):
 
 
 class Sound(base.SFMLClass, SoundSource):
+    # The buffer set, kept alive as long as the sound plays from it
+    __slots__ = ('_buffer',)
+    _sf_destroy = _sf.sfSound_destroy
     def __init__(self, buffer=None, **kwargs):
         self._sfSound = _sf.sfSound_create()
+        self._sf_manage()
         if buffer: self.buffer = buffer
         if kwargs: self._set(**kwargs)
     
     def copy(self):
         result = _sf.sfSound_copy(self._sfSound)
-        return self._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfSound_destroy(self._sfSound)
+        result = self._wrap_ptr(result, owned=True)
+        try: result._buffer = self._buffer
+        except AttributeError: pass
+        return result
     
     def play(self):
         return _sf.sfSound_play(self._sfSound)
@@ -202,12 +219,15 @@ class Sound(base.SFMLClass, SoundSource):
         return _sf.sfSound_stop(self._sfSound)
     
     def get_buffer(self):
+        try: return self._buffer
+        except AttributeError: pass
         result = _sf.sfSound_getBuffer(self._sfSound)
         return SoundBuffer._wrap_ptr(result)
     def set_buffer(self, buffer):
-        try: buffer = buffer._sfSoundBuffer
+        try: sf_buffer = buffer._sfSoundBuffer
         except AttributeError: raise _arg_error('buffer', 'SoundBuffer')
-        return _sf.sfSound_setBuffer(self._sfSound, buffer)
+        self._buffer = buffer
+        return _sf.sfSound_setBuffer(self._sfSound, sf_buffer)
     buffer = property(get_buffer, set_buffer)
     
     def get_loop(self):
@@ -272,19 +292,25 @@ class Sound(base.SFMLClass, SoundSource):
     
 
 class SoundBuffer(base.SFMLClass):
+    _sf_destroy = _sf.sfSoundBuffer_destroy
     @classmethod
     def from_file(cls, filename):
         try: filename = filename.encode()
         except AttributeError: pass
         result = _sf.sfSoundBuffer_createFromFile(filename)
         if not result: raise IOError("Could not create SoundBuffer from file {!r}".format(filename))
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
     
     @classmethod
     def from_memory(cls, data):
+        data, size = _memory_buffer(data)
+        result = _sf.sfSoundBuffer_createFromMemory(data, size)
         if not result: raise IOError("Could not create SoundBuffer from memory")
-        result = _sf.sfSoundBuffer_createFromMemory(data, len(data))
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
+
+    @classmethod
+    def from_mmap(cls, filename, offset=0, length=None):
+        return cls.from_memory(_map_file(filename, offset, length))
     
     @classmethod
     def from_stream(cls, stream):
@@ -292,20 +318,17 @@ class SoundBuffer(base.SFMLClass):
         except AttributeError: raise _arg_error('stream', 'InputStream')
         result = _sf.sfSoundBuffer_createFromStream(stream)
         if not result: raise IOError("Could not create SoundBuffer from stream")
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
     
     @classmethod
     def from_samples(cls, samples, channel_count, sample_rate):
         result = _sf.sfSoundBuffer_createFromSamples(samples, sample_count, channel_count, sample_rate)
         if not result: raise IOError("Could not create SoundBuffer from samples")
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
     
     def copy(self):
         result = _sf.sfSoundBuffer_copy(self._sfSoundBuffer)
-        return self._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfSoundBuffer_destroy(self._sfSoundBuffer)
+        return self._wrap_ptr(result, owned=True)
     
     def save_to_file(self, filename):
         return _sf.sfSoundBuffer_saveToFile(self._sfSoundBuffer, filename)
@@ -316,6 +339,9 @@ class SoundBuffer(base.SFMLClass):
     
     def get_sample_count(self):
         return _sf.sfSoundBuffer_getSampleCount(self._sfSoundBuffer)
+
+    def _sf_size(self):
+        return _sf.sfSoundBuffer_getSampleCount(self._sfSoundBuffer)*_ffi.sizeof('sfInt16')
     
     def get_sample_rate(self):
         return _sf.sfSoundBuffer_getSampleRate(self._sfSoundBuffer)
@@ -331,13 +357,12 @@ class SoundBuffer(base.SFMLClass):
     duration = property(get_duration)
     
 class SoundRecorder(base.SFMLClass):
+    _sf_destroy = _sf.sfSoundRecorder_destroy
     def __init__(self, on_start, on_process, on_stop, user_data, **kwargs):
         self._sfSoundRecorder = _sf.sfSoundRecorder_create(on_start, on_process, on_stop, user_data)
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
 
-    def __del__(self):
-        if self._sf_owned: _sf.sfSoundRecorder_destroy(self._sfSoundRecorder)
-
     def start(self, sample_rate):
         return _sf.sfSoundRecorder_start(self._sfSoundRecorder, sample_rate)
 
@@ -353,13 +378,12 @@ class SoundRecorder(base.SFMLClass):
 
 
 class SoundBufferRecorder(SoundRecorder):
+    _sf_destroy = _sf.sfSoundBufferRecorder_destroy
     def __init__(self, **kwargs):
         self._sfSoundBufferRecorder = _sf.sfSoundBufferRecorder_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
-    def __del__(self):
-        if self._sf_owned: _sf.sfSoundBufferRecorder_destroy(self._sfSoundBufferRecorder)
-    
     def start(self, sample_rate):
         return _sf.sfSoundBufferRecorder_start(self._sfSoundBufferRecorder, sample_rate)
     
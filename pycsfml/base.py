@@ -22,6 +22,11 @@ from __future__ import division, absolute_import, print_function
 
 from .ffi import ffi as _ffi
 
+import weakref as _weakref
+import threading as _threading
+import time as _time
+import json as _json
+
 try:
     from enum import IntEnum as SFMLEnum
 except ImportError:
@@ -29,33 +34,189 @@ except ImportError:
         pass
 
 
-class SFMLClass(object):
-    _sf_owned = True
+_package = __name__.rpartition('.')[0]+'.'
+
+class SFMLType(type):
+    # Every wrapper class defined in this package keeps its CSFML pointer in a
+    # slot named '_sf'+<class name>. User subclasses reuse their base's slot.
+    def __new__(meta, name, bases, namespace):
+        module = namespace.get('__module__', '')
+        if module.startswith(_package) and module!=__name__:
+            attr = namespace.get('_sf_attr', '_sf'+name)
+            slots = tuple(namespace.get('__slots__', ()))
+            if attr not in namespace and attr not in slots:
+                slots += (attr,)
+            namespace['__slots__'] = slots
+            namespace['_sf_attr'] = attr
+        cls = type.__new__(meta, name, bases, namespace)
+        if '_sf_type' in namespace:
+            cls._sf_bind()
+        return cls
+
+_SFMLBase = SFMLType(str('_SFMLBase'), (object,), {'__slots__': ()})
+
+_new = object.__new__
+
+
+# Number of live owned native objects per wrapper type
+_live = {}
+_live_lock = _threading.Lock()
+
+def live_objects():
+    with _live_lock:
+        return dict(_live)
+
+def _release(destroy, sf_ptr, type_name):
+    destroy(sf_ptr)
+    with _live_lock:
+        _live[type_name] -= 1
+
+
+# Optional registry of the live owned wrappers themselves, used for memory
+# accounting. Only objects taking ownership while it is enabled are tracked.
+_registry = None
+
+def enable_registry():
+    global _registry
+    with _live_lock:
+        if _registry is None:
+            _registry = _weakref.WeakSet()
+
+def disable_registry():
+    global _registry
+    with _live_lock:
+        _registry = None
+
+def registry_enabled():
+    return _registry is not None
+
+def memory_usage():
+    with _live_lock:
+        objects = list(_registry) if _registry is not None else []
+    result = {}
+    for obj in objects:
+        try: size = obj._sf_size()
+        except AttributeError: continue # destroyed meanwhile
+        entry = result.setdefault(type(obj).__name__, {'count': 0, 'bytes': 0})
+        entry['count'] += 1
+        entry['bytes'] += size
+    return result
+
+def snapshot():
+    types = memory_usage()
+    return {
+        'time': _time.time(),
+        'live': live_objects(),
+        'types': types,
+        'total_bytes': sum(entry['bytes'] for entry in types.values()),
+    }
+
+def dump_snapshot(file):
+    data = snapshot()
+    if hasattr(file, 'write'):
+        _json.dump(data, file, indent=2, sort_keys=True)
+    else:
+        with open(file, 'w') as f:
+            _json.dump(data, f, indent=2, sort_keys=True)
+    return data
+
+
+class SFMLClass(_SFMLBase):
+    # Subclasses in this package list any other attributes they store in
+    # `__slots__` too; user subclasses get a `__dict__` as usual
+    __slots__ = ('_sf_finalizer', '__weakref__')
+    _sf_attr = None
+    # The CSFML function that frees the native object, for classes that own one.
+    # Their constructors call `_sf_manage()` right after creating it.
+    _sf_destroy = None
+    # Other attributes holding the same pointer, removed with it by `destroy()`
+    _sf_aliases = ()
 
     def __init__(self, *args, **kwargs):
         raise NotImplementedError("This class is not meant to be instantiated")
 
+    # Called on creation of every class that sets `_sf_type`, to resolve the
+    # C functions its methods use once instead of on every call
     @classmethod
-    def _wrap_ptr(cls, sf_ptr, owned=False): #TODO owned
-        self = object.__new__(cls)
-        setattr(self, '_sf'+cls.__name__, sf_ptr)
-        self._sf_owned = owned
-        return self
+    def _sf_bind(cls):
+        pass
 
     @classmethod
-    def _wrap_data(cls, sf_data, owned=False):
-        self = object.__new__(cls)
-        self._sf_data = sf_data
-        sf_ptr = _ffi.addressof(sf_data)
-        setattr(self, '_sf'+cls.__name__, sf_ptr)
-        self._sf_owned = owned
+    def _wrap_ptr(cls, sf_ptr, owned=False):
+        self = _new(cls)
+        setattr(self, cls._sf_attr, sf_ptr)
+        if owned:
+            self._sf_manage()
+        return self
+
+    # Takes ownership of the native object this wrapper points to: it will be
+    # destroyed exactly once, by `destroy()` or when the wrapper is collected
+    def _sf_manage(self):
+        destroy = type(self)._sf_destroy
+        if destroy is None:
+            return
+        sf_ptr = getattr(self, self._sf_attr)
+        finalizer = getattr(self, '_sf_finalizer', None)
+        if finalizer is not None and finalizer.alive:
+            if finalizer.peek()[2][1]==sf_ptr:
+                return
+            finalizer()
+        type_name = type(self).__name__
+        with _live_lock:
+            _live[type_name] = _live.get(type_name, 0)+1
+        self._sf_finalizer = _weakref.finalize(self, _release, destroy, sf_ptr, type_name)
+        if _registry is not None:
+            with _live_lock:
+                if _registry is not None:
+                    _registry.add(self)
+
+    # Estimated number of bytes held by the native object
+    def _sf_size(self):
+        return 0
+
+    # Gives up ownership without destroying the native object
+    def _sf_disown(self):
+        finalizer = getattr(self, '_sf_finalizer', None)
+        if finalizer is not None and finalizer.detach() is not None:
+            type_name = type(self).__name__
+            with _live_lock:
+                _live[type_name] -= 1
+                if _registry is not None:
+                    _registry.discard(self)
+
+    def destroy(self):
+        finalizer = getattr(self, '_sf_finalizer', None)
+        if finalizer is not None and finalizer.alive:
+            finalizer()
+            if _registry is not None:
+                with _live_lock:
+                    if _registry is not None:
+                        _registry.discard(self)
+            for attr in (self._sf_attr,)+self._sf_aliases:
+                try: delattr(self, attr)
+                except AttributeError: pass
+    close = destroy
+
+    def __enter__(self):
         return self
+    def __exit__(self, typ, value, tb):
+        self.destroy()
 
     def _set(self, **kwargs):
         for k, v in kwargs.items():
             setattr(self, k, v)
 
 class SFMLStruct(SFMLClass):
+    # The struct pointed to, when the wrapper owns it
+    __slots__ = ('_sf_data',)
+
+    @classmethod
+    def _wrap_data(cls, sf_data):
+        self = _new(cls)
+        self._sf_data = sf_data
+        setattr(self, cls._sf_attr, _ffi.addressof(sf_data))
+        return self
+
     def _repr(self, attrs):
         try:
             cls_name = type(self).__qualname__
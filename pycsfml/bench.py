@@ -0,0 +1,185 @@
+# PyCSFML - Python bindings for SFML
+# Copyright (c) 2014, Oleh Prypin <blaxpirit@gmail.com>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty. In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+
+
+from __future__ import division, absolute_import, print_function
+
+# Startup benchmarks. Every measurement runs in a fresh interpreter:
+#
+#     python -m pycsfml.bench startup --runs 10 --output startup.json
+#     python -m pycsfml.bench startup --baseline startup.json
+#
+# "cold" runs start with an empty header cache, "warm" runs reuse one.
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+
+
+modules = ['system', 'window', 'graphics', 'audio', 'network', 'all']
+
+_child_code = '''
+import sys, json
+from timeit import default_timer as timer
+start = timer()
+__import__(sys.argv[1])
+total = timer()-start
+from pycsfml import ffi
+print(json.dumps({'total': total, 'timings': ffi.timings, 'backend': 'abi' if ffi._lib is None else 'api'}))
+'''
+
+def _parse_importtime(output):
+    result = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+        name = name.strip()
+        if name.startswith('pycsfml'):
+            result[name] = {'self': self_us/1e6, 'cumulative': cumulative_us/1e6}
+    return result
+
+def run_import(module_name, cache_dir):
+    env = dict(os.environ, PYCSFML_CACHE_DIR=cache_dir)
+    proc = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', _child_code, 'pycsfml.'+module_name],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, universal_newlines=True
+    )
+    out, err = proc.communicate()
+    if proc.returncode:
+        raise RuntimeError("Importing pycsfml.{} failed:\n{}".format(module_name, err))
+    result = json.loads(out.strip().splitlines()[-1])
+    phases = {}
+    for phase, subsystem, seconds in result.pop('timings'):
+        phases[phase] = phases.get(phase, 0)+seconds
+    phases['python'] = result['total']-sum(phases.values())
+    result['phases'] = phases
+    result['modules'] = _parse_importtime(err)
+    return result
+
+def _median(values):
+    values = sorted(values)
+    n = len(values)
+    return values[n//2] if n%2 else (values[n//2-1]+values[n//2])/2
+
+def _summarize(runs):
+    summary = {'total': _median([r['total'] for r in runs]), 'runs': len(runs), 'phases': {}, 'modules': {}}
+    for phase in sorted(set(p for r in runs for p in r['phases'])):
+        summary['phases'][phase] = _median([r['phases'].get(phase, 0) for r in runs])
+    for name in sorted(set(m for r in runs for m in r['modules'])):
+        summary['modules'][name] = _median([r['modules'].get(name, {}).get('self', 0) for r in runs])
+    return summary
+
+def startup(module_names=modules, runs=5):
+    results = {}
+    backend = None
+    for module_name in module_names:
+        cache_dir = tempfile.mkdtemp(prefix='pycsfml-bench-')
+        try:
+            cold = []
+            for i in range(runs):
+                shutil.rmtree(cache_dir)
+                os.mkdir(cache_dir)
+                cold.append(run_import(module_name, cache_dir))
+            warm = [run_import(module_name, cache_dir) for i in range(runs)]
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        backend = warm[-1]['backend']
+        results[module_name] = {'cold': _summarize(cold), 'warm': _summarize(warm)}
+    return {
+        'benchmark': 'startup',
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'backend': backend,
+        'results': results,
+    }
+
+
+def format_report(report):
+    lines = ["Backend: {}, Python {} ({})".format(report['backend'], report['python'], report['platform'])]
+    for module_name, result in sorted(report['results'].items()):
+        for kind in ['cold', 'warm']:
+            r = result[kind]
+            phases = ', '.join('{} {:.1f}'.format(p, t*1000) for p, t in sorted(r['phases'].items()))
+            lines.append("pycsfml.{:<10} {}  {:8.1f} ms  ({})".format(module_name, kind, r['total']*1000, phases))
+            for name, t in sorted(r['modules'].items(), key=lambda kv: -kv[1]):
+                lines.append("    {:<28} {:8.1f} ms".format(name, t*1000))
+    return '\n'.join(lines)
+
+def compare(report, baseline, threshold):
+    regressions = []
+    for module_name, result in sorted(report['results'].items()):
+        try:
+            old = baseline['results'][module_name]
+        except KeyError:
+            continue
+        for kind in ['cold', 'warm']:
+            new_t, old_t = result[kind]['total'], old[kind]['total']
+            if old_t and new_t/old_t>threshold:
+                regressions.append("pycsfml.{} {}: {:.1f} ms -> {:.1f} ms".format(module_name, kind, old_t*1000, new_t*1000))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycsfml.bench')
+    sub = parser.add_subparsers(dest='benchmark')
+    p = sub.add_parser('startup', help="import time of each module, cold and warm")
+    # Not checked with `choices`, which rejects an empty list on some Python versions
+    p.add_argument('modules', nargs='*', metavar='module', help="one of {} (default: all)".format(', '.join(modules)))
+    p.add_argument('--runs', type=int, default=5, help="runs per measurement (median is reported)")
+    p.add_argument('--output', '-o', help="write the results to this JSON file")
+    p.add_argument('--baseline', help="compare with results previously written by --output")
+    p.add_argument('--threshold', type=float, default=1.2, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+    if args.benchmark!='startup':
+        parser.print_help()
+        return 2
+    for name in args.modules:
+        if name not in modules:
+            p.error("invalid module: {!r} (choose from {})".format(name, ', '.join(map(repr, modules))))
+
+    report = startup(args.modules or modules, args.runs)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print("Regression:", line)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
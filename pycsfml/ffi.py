@@ -20,69 +20,62 @@
 
 from __future__ import division, absolute_import, print_function
 
-import os.path
-import re
+import os as _os
+from timeit import default_timer as _timer
 
-from cffi import FFI
+__all__ = ['ffi', 'declare', 'load']
 
 
-inc_path = '/usr/include'
+# Prefer the compiled out-of-line module built by `python -m pycsfml.ffibuilder`
+try:
+    from ._pycsfml_cffi import ffi, lib as _lib
+except ImportError:
+    _lib = None
 
+    from cffi import FFI
+    from . import headers as _headers
 
-src = ['''
-typedef unsigned long sfWindowHandle;
-typedef int size_t;
-typedef int wchar_t;
-''']
+    ffi = FFI()
 
-visited = set()
-def visit_header(file_path):
-    if file_path in visited:
-        return
-    visited.add(file_path)
-    with open(os.path.join(inc_path, file_path)) as src_file:
-        #src.append('\n\n;;;;enum {};;;;\n\n'.format(file_path[:-2].replace('/', '_')))
-        for line in src_file:
-            if '//' in line:
-                line = line.split('//')[0]
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith('#include'):
-                m = re.match(r'#include <(SFML/.+\.h)>', line)
-                if m and not m.group(1).endswith('Export.h'):
-                    visit_header(m.group(1))
-            if line.startswith('#') or line.startswith('//'):
-                continue
-            if '__int64' in line or 'HWND__' in line:
-                continue
-            if line.startswith('typedef') and line.rstrip(';').endswith('sfWindowHandle'):
-                continue
-            if '_API' in line:
-                line = re.sub(r'CSFML_[A-Z]+_API ?', '', line)
-            line = line.replace('(void)', '()')
-            if '<<' in line:
-                line = re.sub(r'1 *<< *([0-9]+)', lambda m: str(1<<int(m.group(1))), line)
-            line = line.replace('sfTitlebar | sfResize | sfClose', '7')
-            src.append(line)
-    src.append('\n')
-
-module_names = ['system', 'window', 'graphics', 'audio', 'network']
-
-__all__ = ['ffi']
-
-for m in module_names:
-    visit_header('SFML/{}.h'.format(m.capitalize()))
-
-del visited
+_declared = {}
 
-src = '\n'.join(src)
+# (phase, subsystem, seconds) for every step taken so far; see pycsfml.bench
+timings = []
 
-
-ffi = FFI()
-
-ffi.cdef(src)
-
-#c = ffi.verify('\n'.join(headers), libraries=['csfml-{}'.format(m) for m in module_names])
-
-del src
\ No newline at end of file
+# Feeds the declarations of a subsystem (and of the subsystems it depends on)
+# to `ffi`, unless that has been done already
+def declare(module_name):
+    if _lib is not None or module_name in _declared:
+        return
+    deps = _headers.dependencies[module_name]
+    exclude = set()
+    for dep in deps:
+        declare(dep)
+        exclude |= _declared[dep]
+    start = _timer()
+    src, headers = _headers.get_source(module_name, exclude, _headers.preamble if not deps else '')
+    timings.append(('source', module_name, _timer()-start))
+    start = _timer()
+    ffi.cdef(src)
+    timings.append(('cdef', module_name, _timer()-start))
+    _declared[module_name] = headers
+
+# Set by pycsfml.profiling while it is enabled; wraps every loaded library
+_wrap_lib = None
+
+def load(module_name):
+    if _lib is not None:
+        lib = _lib
+    else:
+        declare(module_name)
+        start = _timer()
+        lib = ffi.dlopen('libcsfml-{}.so'.format(module_name))
+        timings.append(('dlopen', module_name, _timer()-start))
+    if _wrap_lib is not None:
+        lib = _wrap_lib(lib)
+    return lib
+
+
+if _os.environ.get('PYCSFML_PROFILE'):
+    from . import profiling as _profiling
+    _profiling.enable()
@@ -0,0 +1,54 @@
+# PyCSFML - Python bindings for SFML
+# Copyright (c) 2014, Oleh Prypin <blaxpirit@gmail.com>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty. In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+
+
+from __future__ import division, absolute_import, print_function
+
+# Builds the optional `pycsfml._pycsfml_cffi` extension (CFFI API mode).
+# Run `python -m pycsfml.ffibuilder` from the project root; `pycsfml.ffi`
+# picks the compiled module up automatically instead of dlopen-ing CSFML.
+
+import os.path
+
+from cffi import FFI
+
+from . import headers
+
+
+# size_t and wchar_t are known to the C compiler, and the real width of
+# sfWindowHandle is platform-specific, so let the compiler fill it in
+preamble = '''
+typedef int... sfWindowHandle;
+'''
+
+ffibuilder = FFI()
+
+ffibuilder.cdef(headers.get_full_source(preamble=preamble))
+
+ffibuilder.set_source(
+    'pycsfml._pycsfml_cffi',
+    '\n'.join('#include <SFML/{}.h>'.format(m.capitalize()) for m in headers.module_names),
+    include_dirs=[headers.inc_path],
+    libraries=['csfml-{}'.format(m) for m in headers.module_names],
+)
+
+
+if __name__ == '__main__':
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ffibuilder.compile(tmpdir=root, verbose=True)
@@ -20,15 +20,21 @@
 
 from __future__ import division, absolute_import, print_function
 
-from .ffi import ffi as _ffi
-_sf = _ffi.dlopen('libcsfml-graphics.so')
+import os as _os
+import math as _math
+import operator as _operator
+
+from .ffi import ffi as _ffi, load as _load
+_sf = _load('graphics')
 
 from . import system as _system
 from . import window as _window
 
 from . import base
 from .util import arg_error as _arg_error
+from .util import encode_utf32 as _encode_utf32, decode_utf32 as _decode_utf32
 from .util import Pixels, Rect, Rect as Rectangle
+from .util import memory_buffer as _memory_buffer, map_file as _map_file
 
 
 class BlendMode(base.SFMLEnum):
@@ -47,71 +53,77 @@ class PrimitiveType(base.SFMLEnum):
     QUADS = _sf.sfQuads
 
 
-class Color(base.SFMLStruct):
-    def __init__(self, r=0, g=0, b=0, a=255):
-        self._sfColor = _ffi.new('sfColor*')
-        self.r = r
-        self.g = g
-        self.b = b
-        self.a = a
-    
-    @property
-    def r(self):
-        return self._sfColor.r
-    @r.setter
-    def r(self, value):
-        self._sfColor.r = value
-    
-    @property
-    def g(self):
-        return self._sfColor.g
-    @g.setter
-    def g(self, value):
-        self._sfColor.g = value
-    
-    @property
-    def b(self):
-        return self._sfColor.b
-    @b.setter
-    def b(self, value):
-        self._sfColor.b = value
-    
+class Color(tuple):
+    # An immutable (r, g, b, a) tuple, passed by value to CSFML functions.
+    # Instances are interned, so that colors used over and over (per vertex,
+    # per frame...) are only created once.
+    __slots__ = ()
+
+    def __new__(cls, r=0, g=0, b=0, a=255):
+        key = r, g, b, a
+        try: return _colors[key]
+        except KeyError: pass
+        except TypeError: _arg_error('color', 'Color')
+        for value in key:
+            if not 0<=value<=255:
+                raise ValueError("Color components must be in 0..255, got {!r}".format(key))
+        self = tuple.__new__(cls, (int(r), int(g), int(b), int(a)))
+        if cls is Color and len(_colors)<_max_interned:
+            _colors[key] = self
+        return self
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    r = property(_operator.itemgetter(0))
+    g = property(_operator.itemgetter(1))
+    b = property(_operator.itemgetter(2))
+    a = property(_operator.itemgetter(3))
+
+    # 0xRRGGBBAA, like sfColor_fromInteger/sfColor_toInteger
+    @classmethod
+    def from_integer(cls, value):
+        return cls(value>>24 & 0xff, value>>16 & 0xff, value>>8 & 0xff, value & 0xff)
+    def to_integer(self):
+        r, g, b, a = self
+        return r<<24 | g<<16 | b<<8 | a
+    __int__ = to_integer
+
+    @classmethod
+    def _wrap_data(cls, sf_color):
+        return cls(sf_color.r, sf_color.g, sf_color.b, sf_color.a)
+
+    # A new sfColor*, for code that still expects the old mutable wrapper
     @property
-    def a(self):
-        return self._sfColor.a
-    @a.setter
-    def a(self, value):
-        self._sfColor.a = value
-    
+    def _sfColor(self):
+        return _ffi.new('sfColor*', self)
+
     def __repr__(self):
-        return self._repr('r= g= b= a=')
+        return '{}(r={!r}, g={!r}, b={!r}, a={!r})'.format(type(self).__name__, *self)
 
     def add(self, other):
-        try: other = other._sfColor[0]
-        except AttributeError: _arg_error('other', 'Color')
-        result = _sf.sfColor_add(self._sfColor[0], other)
-        return self._wrap_data(result)
+        r1, g1, b1, a1 = self
+        try: r2, g2, b2, a2 = other
+        except (TypeError, ValueError): _arg_error('other', 'Color')
+        return Color(min(r1+r2, 255), min(g1+g2, 255), min(b1+b2, 255), min(a1+a2, 255))
     __add__ = add
     
     def modulate(self, other):
-        try: other = other._sfColor[0]
-        except AttributeError: _arg_error('other', 'Color')
-        result = _sf.sfColor_modulate(self._sfColor[0], other)
-        return self._wrap_data(result)
+        r1, g1, b1, a1 = self
+        try: r2, g2, b2, a2 = other
+        except (TypeError, ValueError): _arg_error('other', 'Color')
+        return Color(r1*r2//255, g1*g2//255, b1*b2//255, a1*a2//255)
     __mul__ = modulate
 
-    def __iter__(self):
-        yield self.r
-        yield self.g
-        yield self.b
-        yield self.a
-    def __hash__(self):
-        return hash(tuple(self))
+_colors = {}
+_max_interned = 4096
 
-    def __eq__(self, other):
-        return all(a==b for a, b in zip(self, other))
-    def __ne__(self, other):
-        return any(a!=b for a, b in zip(self, other))
+# -> Color for a Color or any (r, g, b[, a]) sequence
+def _to_color(color, name='color'):
+    if type(color) is Color:
+        return color
+    try: return Color(*color)
+    except TypeError: _arg_error(name, 'Color')
 
 Color.BLACK = Color(0, 0, 0)
 Color.WHITE = Color(255, 255, 255)
@@ -146,8 +158,7 @@ class Transform(base.SFMLStruct):
 
     @classmethod
     def from_values(cls, a00, a01, a02, a10, a11, a12, a20, a21, a22):
-        result = _sf.sfTransform_fromMatrix(a00, a01, a02, a10, a11, a12, a20, a21, a22)
-        return cls._wrap_data(result)
+        return cls((a00, a01, a02, a10, a11, a12, a20, a21, a22))
 
     def get_matrix(self):
         m = _ffi.new('float[16]')
@@ -155,147 +166,247 @@ class Transform(base.SFMLStruct):
         return tuple(m)
     matrix = property(get_matrix)
 
+    # The math below is done in Python on the 3x3 row-major values, the same
+    # way SFML does it, as that is cheaper than going through CSFML
+
     def get_inverse(self):
-        result = _sf.sfTransform_getInverse(self._sfTransform)
-        return self._wrap_data(result)
+        a00, a01, a02, a10, a11, a12, a20, a21, a22 = self._sfTransform.matrix
+        det = a00*(a22*a11-a21*a12)-a10*(a22*a01-a21*a02)+a20*(a12*a01-a11*a02)
+        if not det:
+            return Transform()
+        return Transform((
+            (a22*a11-a21*a12)/det, -(a22*a01-a21*a02)/det, (a12*a01-a11*a02)/det,
+            -(a22*a10-a20*a12)/det, (a22*a00-a20*a02)/det, -(a12*a00-a10*a02)/det,
+            (a21*a10-a20*a11)/det, -(a21*a00-a20*a01)/det, (a11*a00-a10*a01)/det,
+        ))
     inverse = property(get_inverse)
 
     def transform_point(self, point):
-        point = _system.Vector2(point)
-        try: point = point._sfVector2f[0]
-        except AttributeError: _arg_error('point', 'Vector2f')
-        result = _sf.sfTransform_transformPoint(self._sfTransform, point)
-        return _system.Vector2(result.x, result.y)
+        x, y = point
+        m = self._sfTransform.matrix
+        return _system.Vector2(m[0]*x+m[1]*y+m[2], m[3]*x+m[4]*y+m[5])
+
+    # Transforms an (N, 2) array-like of points at once with NumPy,
+    # -> (N, 2) float array
+    def transform_points(self, points):
+        import numpy
+        points = numpy.asarray(points)
+        if points.dtype.kind!='f':
+            points = points.astype(numpy.float64)
+        m = numpy.array(tuple(self._sfTransform.matrix), dtype=points.dtype).reshape(3, 3)
+        return points.dot(m[:2, :2].T)+m[:2, 2]
 
     def transform_rect(self, rectangle):
-        try: rectangle = rectangle._sfFloatRect[0]
+        try: left, top, width, height = rectangle.left, rectangle.top, rectangle.width, rectangle.height
         except AttributeError: _arg_error('rectangle', 'Rect')
-        result = _sf.sfTransform_transformRect(self._sfTransform, rectangle)
-        return Rect((result.left, result.top), (result.width, result.height))
+        m = self._sfTransform.matrix
+        a, b, c, d, e, f = m[0], m[1], m[2], m[3], m[4], m[5]
+        xs = []
+        ys = []
+        for x, y in ((left, top), (left, top+height), (left+width, top), (left+width, top+height)):
+            xs.append(a*x+b*y+c)
+            ys.append(d*x+e*y+f)
+        return Rect((min(xs), min(ys)), (max(xs)-min(xs), max(ys)-min(ys)))
     transform_rectangle = transform_rect
 
+    def _combine(self, b):
+        a00, a01, a02, a10, a11, a12, a20, a21, a22 = self._sfTransform.matrix
+        b00, b01, b02, b10, b11, b12, b20, b21, b22 = b
+        self._sfTransform.matrix = (
+            a00*b00+a01*b10+a02*b20, a00*b01+a01*b11+a02*b21, a00*b02+a01*b12+a02*b22,
+            a10*b00+a11*b10+a12*b20, a10*b01+a11*b11+a12*b21, a10*b02+a11*b12+a12*b22,
+            a20*b00+a21*b10+a22*b20, a20*b01+a21*b11+a22*b21, a20*b02+a21*b12+a22*b22,
+        )
+        return self
+
     def combine(self, other):
         try: other = other._sfTransform
-        except AttributeError: raise base._arg_error('other', 'Transform')
-        _sf.sfTransform_combine(self._sfTransform, other)
-        return self
+        except AttributeError: _arg_error('other', 'Transform')
+        return self._combine(other.matrix)
     __imul__ = combine
     def __mul__(self, other):
         return Transform(self.values).combine(other)
 
     def translate(self, offset):
         x, y = offset
-        _sf.sfTransform_translate(self._sfTransform, x, y)
-        return self
+        return self._combine((1, 0, x, 0, 1, y, 0, 0, 1))
 
     def rotate(self, angle, center=None):
+        rad = angle*_math.pi/180
+        cos, sin = _math.cos(rad), _math.sin(rad)
         if center is None:
-            _sf.sfTransform_rotate(self._sfTransform, angle)
-        else:
-            x, y = center
-            _sf.sfTransform_rotateWithCenter(self._sfTransform, angle, x, y)
-        return self
+            return self._combine((cos, -sin, 0, sin, cos, 0, 0, 0, 1))
+        x, y = center
+        return self._combine((cos, -sin, x*(1-cos)+y*sin, sin, cos, y*(1-cos)-x*sin, 0, 0, 1))
 
     def scale(self, factor, center=None):
         fx, fy = factor
         if center is None:
-            _sf.sfTransform_scale(self._sfTransform, fx, fy)
-        else:
-            cx, cy = center
-            _sf.sfTransform_scaleWithCenter(self._sfTransform, fx, fy, cx, cy)
-        return self
+            return self._combine((fx, 0, 0, 0, fy, 0, 0, 0, 1))
+        cx, cy = center
+        return self._combine((fx, 0, cx*(1-fx), 0, fy, cy*(1-fy), 0, 0, 1))
+
+def _unavailable(name):
+    def unavailable(*args):
+        raise NotImplementedError("{} is not available in CSFML".format(name))
+    return unavailable
 
 class Transformable(base.SFMLClass):
     _sf_type = 'sfTransformable'
+    _sf_destroy = _sf.sfTransformable_destroy
+    _sf_aliases = ('_sfTransformable',)
+    # Bound as `_sf_<name>` = `<_sf_type>_<name>` for each subclass
+    _sf_functions = (
+        'copy', 'getPosition', 'setPosition', 'getRotation', 'setRotation',
+        'getScale', 'setScale', 'getOrigin', 'setOrigin', 'move', 'rotate', 'scale',
+        'getTransform', 'getInverseTransform',
+    )
     def __init__(self, **kwargs):
         self._sfTransformable = _sf.sfTransformable_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
 
-    def copy(self):
-        result = getattr(_sf, self._sf_type+'_copy')(self._sfTransformable)
-        return self._wrap_ptr(result)
+    @classmethod
+    def _sf_bind(cls):
+        for name in cls._sf_functions:
+            func = getattr(_sf, cls._sf_type+'_'+name, None) or _unavailable(cls._sf_type+'_'+name)
+            setattr(cls, '_sf_'+name, staticmethod(func))
 
-    def __del__(self):
-        if self._sf_owned: getattr(_sf, self._sf_type+'_destroy')(self._sfTransformable)
+    @classmethod
+    def _wrap_ptr(cls, sf_ptr, owned=False):
+        self = super(Transformable, cls)._wrap_ptr(sf_ptr)
+        self._sfTransformable = sf_ptr
+        if owned: self._sf_manage()
+        return self
+
+    def copy(self):
+        result = self._sf_copy(self._sfTransformable)
+        result = self._wrap_ptr(result, owned=True)
+        # The copy uses the same texture or font, so it keeps it alive too
+        for attr in ('_texture', '_font'):
+            try: setattr(result, attr, getattr(self, attr))
+            except AttributeError: pass
+        return result
 
 
     def get_position(self):
-        result = getattr(_sf, self._sf_type+'_getPosition')(self._sfTransformable)
+        result = self._sf_getPosition(self._sfTransformable)
         return _system.Vector2(result.x, result.y)
     def set_position(self, position):
         position = _system.Vector2(position)._sfVector2f[0]
-        return getattr(_sf, self._sf_type+'_setPosition')(self._sfTransformable, position)
+        return self._sf_setPosition(self._sfTransformable, position)
     position = property(get_position, set_position)
 
     def get_rotation(self):
-        return getattr(_sf, self._sf_type+'_getRotation')(self._sfTransformable)
+        return self._sf_getRotation(self._sfTransformable)
     def set_rotation(self, angle):
-        return getattr(_sf, self._sf_type+'_setRotation')(self._sfTransformable, angle)
+        return self._sf_setRotation(self._sfTransformable, angle)
     rotation = property(get_rotation, set_rotation)
 
     def get_scale(self):
-        result = getattr(_sf, self._sf_type+'_getScale')(self._sfTransformable)
+        result = self._sf_getScale(self._sfTransformable)
         return _system.Vector2(result.x, result.y)
     def set_scale(self, scale):
         scale = _system.Vector2(scale)._sfVector2f[0]
-        return getattr(_sf, self._sf_type+'_setScale')(self._sfTransformable, scale)
+        return self._sf_setScale(self._sfTransformable, scale)
     ratio = property(get_scale, set_scale)
 
     def get_origin(self):
-        result = getattr(_sf, self._sf_type+'_getOrigin')(self._sfTransformable)
+        result = self._sf_getOrigin(self._sfTransformable)
         return _system.Vector2(result.x, result.y)
     def set_origin(self, origin):
         origin = _system.Vector2(origin)._sfVector2f[0]
-        return getattr(_sf, self._sf_type+'_setOrigin')(self._sfTransformable, origin)
+        return self._sf_setOrigin(self._sfTransformable, origin)
     origin = property(get_origin, set_origin)
 
 
     def move(self, offset):
         offset = _system.Vector2(offset)._sfVector2f[0]
-        return getattr(_sf, self._sf_type+'_move')(self._sfTransformable, offset)
+        return self._sf_move(self._sfTransformable, offset)
 
     def rotate(self, angle):
-        return getattr(_sf, self._sf_type+'_rotate')(self._sfTransformable, angle)
+        return self._sf_rotate(self._sfTransformable, angle)
 
     def scale(self, factors):
         factors = _system.Vector2(factors)._sfVector2f[0]
-        return getattr(_sf, self._sf_type+'_scale')(self._sfTransformable, factors)
+        return self._sf_scale(self._sfTransformable, factors)
 
     def get_transform(self):
-        result = getattr(_sf, self._sf_type+'_getTransform')(self._sfTransformable)
+        result = self._sf_getTransform(self._sfTransformable)
         return Transform._wrap_data(result)
     transform = property(get_transform)
 
     def get_inverse_transform(self):
-        getattr(_sf, self._sf_type+'_getInverseTransform')(self._sfTransformable)
+        result = self._sf_getInverseTransform(self._sfTransformable)
         return Transform._wrap_data(result)
     inverse_transform = property(get_inverse_transform)
 
 
 class Drawable(object):
+    __slots__ = ()
     def draw(self, target, states):
         raise NotImplementedError("Reimplement `draw` in your subclass")
 
+# (target class, drawable class) -> (C function drawing the CSFML object, or
+# None for drawables implemented in Python only, target attribute, drawable
+# attribute, whether `draw` is implemented in Python). Subclasses overriding
+# `draw` still get the C function, for calling the base class's `draw`.
+_draw_functions = {}
+
+def _draw_function(target_cls, drawable_cls):
+    key = target_cls, drawable_cls
+    try: return _draw_functions[key]
+    except KeyError: pass
+    python = getattr(drawable_cls, 'draw', None) is not _native_draw
+    sf_type = getattr(drawable_cls, '_sf_type', None)
+    func = None
+    if sf_type is not None:
+        func = getattr(_sf, getattr(target_cls, '_sf_type', '')+'_draw'+sf_type[2:], None)
+    if func is None and not python:
+        _arg_error('target', 'RenderTarget')
+    result = func, getattr(target_cls, '_sf_attr', None), getattr(drawable_cls, '_sf_attr', None), python
+    _draw_functions[key] = result
+    return result
+
+# `draw` of the drawables implemented by CSFML; they don't modify the states
+def _native_draw(self, target, states=None):
+    try: func, target_attr, attr, _ = _draw_functions[type(target), type(self)]
+    except KeyError: func, target_attr, attr, _ = _draw_function(type(target), type(self))
+    if func is None: _arg_error('target', 'RenderTarget')
+    if states is None:
+        states = _ffi.NULL
+    else:
+        try: states = states._sfRenderStates
+        except AttributeError: _arg_error('states', 'RenderStates')
+    return func(getattr(target, target_attr), getattr(self, attr), states)
+
 
 class TransformableDrawable(Transformable, Drawable):
-    pass
+    _sf_attr = '_sfTransformable'
 
 class Sprite(Drawable, Transformable):
+    # The texture set, kept alive as long as the sprite uses it
+    __slots__ = ('_texture',)
     _sf_type = 'sfSprite'
+    _sf_destroy = _sf.sfSprite_destroy
     def __init__(self, texture=None, rectangle=None, **kwargs):
         self._sfSprite = _sf.sfSprite_create()
         self._sfTransformable = self._sfSprite
+        self._sf_manage()
         if texture is not None: self.texture = texture
         if rectangle is not None: self.texture_rectangle = rectangle
         if kwargs: self._set(**kwargs)
 
     def get_texture(self):
+        try: return self._texture
+        except AttributeError: pass
         result = _sf.sfSprite_getTexture(self._sfSprite)
         return Texture._wrap_ptr(result)
     def set_texture(self, texture, reset_rect=True):
-        try: texture = texture._sfTexture
+        try: sf_texture = texture._sfTexture
         except AttributeError: _arg_error('texture', 'Texture')
-        return _sf.sfSprite_setTexture(self._sfSprite, texture, reset_rect)
+        self._texture = texture
+        return _sf.sfSprite_setTexture(self._sfSprite, sf_texture, reset_rect)
     texture = property(get_texture, set_texture)
 
     def get_texture_rect(self):
@@ -311,8 +422,7 @@ class Sprite(Drawable, Transformable):
         result = _sf.sfSprite_getColor(self._sfSprite)
         return Color._wrap_data(result)
     def set_color(self, color):
-        try: color = color._sfColor[0]
-        except AttributeError: _arg_error('color', 'Color')
+        color = _to_color(color)
         return _sf.sfSprite_setColor(self._sfSprite, color)
     color = property(get_color, set_color)
 
@@ -327,28 +437,36 @@ class Sprite(Drawable, Transformable):
     global_bounds = property(get_global_bounds)
 
 
-    def draw(self, target, states):
-        try: starget = getattr(target, '_'+target._sf_type)
-        except AttributeError: _arg_error('target', 'RenderTarget')
-        try: states = states._sfRenderStates
-        except AttributeError: _arg_error('states', 'RenderStates')
-        return getattr(_sf, target._sf_type+'_drawSprite')(starget, self._sfSprite, states)
+    draw = _native_draw
 
 
 class Font(base.SFMLClass):
+    __slots__ = ('_sf_source', '_sf_file_size', '_glyph_cache', '_kerning_cache', '_line_spacing_cache')
+    _sf_destroy = _sf.sfFont_destroy
     @classmethod
     def from_file(cls, filename):
         try: filename = filename.encode()
         except AttributeError: pass
         result = _sf.sfFont_createFromFile(filename)
         if not result: raise IOError("Could not create Font from file {!r}".format(filename))
-        return cls._wrap_ptr(result)
+        result = cls._wrap_ptr(result, owned=True)
+        try: result._sf_file_size = _os.path.getsize(filename)
+        except OSError: pass
+        return result
     
+    # `data` is any buffer; CSFML reads from it as long as the font lives
     @classmethod
     def from_memory(cls, data):
-        result = _sf.sfFont_createFromMemory(data, len(data))
+        data, size = _memory_buffer(data)
+        result = _sf.sfFont_createFromMemory(data, size)
         if not result: raise IOError("Could not create Font from memory")
-        return cls._wrap_ptr(result)
+        result = cls._wrap_ptr(result, owned=True)
+        result._sf_source = data
+        return result
+
+    @classmethod
+    def from_mmap(cls, filename, offset=0, length=None):
+        return cls.from_memory(_map_file(filename, offset, length))
     
     #@classmethod
     #def from_stream(cls, stream):
@@ -359,24 +477,103 @@ class Font(base.SFMLClass):
     
     def copy(self):
         result = _sf.sfFont_copy(self._sfFont)
-        return self._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfFont_destroy(self._sfFont)
-    
+        result = self._wrap_ptr(result, owned=True)
+        # The copy reads from the same buffer
+        for attr in ('_sf_source', '_sf_file_size'):
+            try: setattr(result, attr, getattr(self, attr))
+            except AttributeError: pass
+        return result
+
+    # Size of the font data, as a lower bound: the glyph textures rendered so
+    # far are not counted
+    def _sf_size(self):
+        try: return len(self._sf_source)
+        except AttributeError: pass
+        try: return self._sf_file_size
+        except AttributeError: return 0
+    
+    # Glyph metrics, kerning and line spacing never change for a given font,
+    # so they are cached per wrapper: (code point, size, bold) -> (advance,
+    # (left, top, width, height) bounds, (left, top, width, height) texture rect)
+    def _glyph_metrics(self, code_point, character_size, bold=False):
+        key = code_point, character_size, bold
+        try: return self._glyph_cache[key]
+        except AttributeError: self._glyph_cache = {}
+        except KeyError: pass
+        glyph = _sf.sfFont_getGlyph(self._sfFont, code_point, character_size, bold)
+        b, t = glyph.bounds, glyph.textureRect
+        result = self._glyph_cache[key] = (
+            glyph.advance,
+            (b.left, b.top, b.width, b.height),
+            (t.left, t.top, t.width, t.height),
+        )
+        return result
+
     def get_glyph(self, code_point, character_size, bold):
         try: code_point = ord(code_point)
         except TypeError: pass
-        result = _sf.sfFont_getGlyph(self._sfFont, code_point, character_size, bold)
-        return Glyph._wrap_data(result)
+        advance, bounds, texture_rect = self._glyph_metrics(code_point, character_size, bool(bold))
+        return Glyph(advance, Rect(bounds), Rect(texture_rect))
     
     def get_kerning(self, first, second, character_size):
         try: first, second = ord(first), ord(second)
         except TypeError: pass
-        return _sf.sfFont_getKerning(self._sfFont, first, second, character_size)
+        key = first, second, character_size
+        try: return self._kerning_cache[key]
+        except AttributeError: self._kerning_cache = {}
+        except KeyError: pass
+        result = self._kerning_cache[key] = _sf.sfFont_getKerning(self._sfFont, first, second, character_size)
+        return result
     
     def get_line_spacing(self, character_size):
-        return _sf.sfFont_getLineSpacing(self._sfFont, character_size)
+        try: return self._line_spacing_cache[character_size]
+        except AttributeError: self._line_spacing_cache = {}
+        except KeyError: pass
+        result = self._line_spacing_cache[character_size] = _sf.sfFont_getLineSpacing(self._sfFont, character_size)
+        return result
+
+    # Lays out a string the way Text does (sf::Text::ensureGeometryUpdate),
+    # -> ([(left, top, width, height, texture rect) of each glyph drawn],
+    # (left, top, width, height) local bounds)
+    def _layout(self, string, character_size, bold):
+        if not string:
+            return [], (0, 0, 0, 0)
+        bold = bool(bold)
+        glyph = self._glyph_metrics
+        kerning = self.get_kerning
+        hspace = glyph(32, character_size, bold)[0]
+        vspace = self.get_line_spacing(character_size)
+        x, y = 0, character_size
+        min_x = min_y = character_size
+        max_x = max_y = 0
+        previous = 0
+        glyphs = []
+        for c in string:
+            c = ord(c)
+            if previous:
+                x += kerning(previous, c, character_size)
+            previous = c
+            if c in (32, 9, 10, 11):
+                min_x, min_y = min(min_x, x), min(min_y, y)
+                if c==32: x += hspace
+                elif c==9: x += hspace*4
+                elif c==10: y += vspace; x = 0
+                else: y += vspace*4
+                max_x, max_y = max(max_x, x), max(max_y, y)
+                continue
+            advance, (left, top, width, height), texture_rect = glyph(c, character_size, bold)
+            left, top = x+left, y+top
+            glyphs.append((left, top, width, height, texture_rect))
+            min_x, max_x = min(min_x, left), max(max_x, left+width)
+            min_y, max_y = min(min_y, top), max(max_y, top+height)
+            x += advance
+        return glyphs, (min_x, min_y, max_x-min_x, max_y-min_y)
+
+    # Local bounds a Text with this string, font and size would have, without
+    # creating one
+    def measure(self, string, character_size=30, bold=False):
+        left, top, width, height = self._layout(string, character_size, bold)[1]
+        return Rect((left, top), (width, height))
     
     def get_texture(self, character_size):
         result = _sf.sfFont_getTexture(self._sfFont, character_size)
@@ -384,37 +581,53 @@ class Font(base.SFMLClass):
     
 
 class Image(base.SFMLClass):
+    _sf_destroy = _sf.sfImage_destroy
     def __init__(self, width, height, **kwargs):
         self._sfImage = _sf.sfImage_create(width, height)
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
     @classmethod
     def from_color(cls, width, height, color):
-        try: color = color._sfColor[0]
-        except AttributeError: _arg_error('color', 'Color')
+        color = _to_color(color)
         result = _sf.sfImage_createFromColor(width, height, color)
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
     create = from_color
     
     @classmethod
     def from_pixels(cls, pixels):
         result = _sf.sfImage_createFromPixels(pixels.width, pixels.height, pixels.data)
         if not result: raise IOError("Could not create Image from pixels")
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
     
+    # `data` is any buffer of width*height RGBA pixels, copied once by CSFML
+    @classmethod
+    def from_buffer(cls, width, height, data):
+        data = _ffi.from_buffer('sfUint8[]', data)
+        if len(data)<width*height*4:
+            raise ValueError("Buffer of {} bytes is too small for {}x{} RGBA pixels".format(len(data), width, height))
+        result = _sf.sfImage_createFromPixels(width, height, data)
+        if not result: raise IOError("Could not create Image from buffer")
+        return cls._wrap_ptr(result, owned=True)
+
     @classmethod
     def from_file(cls, filename):
         try: filename = filename.encode()
         except AttributeError: pass
         result = _sf.sfImage_createFromFile(filename)
         if not result: raise IOError("Could not create Image from file {!r}".format(filename))
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
     
     @classmethod
     def from_memory(cls, data):
-        result = _sf.sfImage_createFromMemory(data, len(data))
+        data, size = _memory_buffer(data)
+        result = _sf.sfImage_createFromMemory(data, size)
         if not result: raise IOError("Could not create Image from memory")
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
+
+    @classmethod
+    def from_mmap(cls, filename, offset=0, length=None):
+        return cls.from_memory(_map_file(filename, offset, length))
     
     #@classmethod
     #def from_stream(cls, stream):
@@ -425,10 +638,7 @@ class Image(base.SFMLClass):
     
     def copy(self):
         result = _sf.sfImage_copy(self._sfImage)
-        return self._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfImage_destroy(self._sfImage)
+        return self._wrap_ptr(result, owned=True)
     
     def save_to_file(self, filename):
         try: filename = filename.encode()
@@ -441,6 +651,10 @@ class Image(base.SFMLClass):
         return _system.Vector2(result.x, result.y)
     size = property(get_size)
 
+    def _sf_size(self):
+        result = _sf.sfImage_getSize(self._sfImage)
+        return result.x*result.y*4
+
     @property
     def width(self):
         return self.size.x
@@ -450,8 +664,7 @@ class Image(base.SFMLClass):
     
     def mask_from_color(self, color, alpha=0):
         image = self._sfImage
-        try: color = color._sfColor[0]
-        except AttributeError: _arg_error('color', 'Color')
+        color = _to_color(color)
         return _sf.sfImage_createMaskFromColor(image, color, alpha)
     create_mask_from_color = mask_from_color
     
@@ -460,6 +673,7 @@ class Image(base.SFMLClass):
         except AttributeError: _arg_error('source', 'Image')
         try: source_rect = source_rect._sfIntRect[0]
         except AttributeError: _arg_error('source_rect', 'Rect')
+        dest_x, dest_y = _system.Vector2(dest)
         return _sf.sfImage_copyImage(self._sfImage, source, dest_x, dest_y, source_rect, apply_alpha)
     blit = copy_image
     
@@ -469,14 +683,25 @@ class Image(base.SFMLClass):
     __getitem__ = get_pixel
     def set_pixel(self, xy, color):
         x, y = xy
-        try: color = color._sfColor[0]
-        except AttributeError: _arg_error('color', 'Color')
+        color = _to_color(color)
         return _sf.sfImage_setPixel(self._sfImage, x, y, color)
     __setitem__ = set_pixel
     
     def get_pixels_ptr(self):
         return Pixels(self.size, _sf.sfImage_getPixelsPtr(self._sfImage))
     pixels = property(get_pixels_ptr)
+
+    # A writable (height, width, 4) memoryview of the pixels, without copying
+    # (flat and empty for an empty image); numpy.asarray() turns it into an
+    # uint8 array sharing the memory. It keeps the image alive.
+    def get_buffer(self):
+        size = _sf.sfImage_getSize(self._sfImage)
+        if not size.x or not size.y:
+            return memoryview(bytearray())
+        pixels = _sf.sfImage_getPixelsPtr(self._sfImage)
+        pixels = _ffi.gc(_ffi.cast('sfUint8*', pixels), lambda _, image=self: None)
+        return memoryview(_ffi.buffer(pixels, size.x*size.y*4)).cast('B', (size.y, size.x, 4))
+    buffer = property(get_buffer)
     
     def flip_horizontally(self):
         return _sf.sfImage_flipHorizontally(self._sfImage)
@@ -485,9 +710,11 @@ class Image(base.SFMLClass):
 
 
 class Texture(base.SFMLClass, _window.GlResource):
+    _sf_destroy = _sf.sfTexture_destroy
     def __init__(self, width, height, **kwargs):
         self._sfTexture = _sf.sfTexture_create(width, height)
         if not self._sfTexture: raise RuntimeError("Could not create a texture of size {!r}, {!r}".format(width, height))
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
 
     @classmethod
@@ -502,15 +729,20 @@ class Texture(base.SFMLClass, _window.GlResource):
         except AttributeError: _arg_error('area', 'Rect')
         result = _sf.sfTexture_createFromFile(filename, area)
         if not result: raise IOError("Could not create Texture from file {!r}".format(filename))
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
 
     @classmethod
     def from_memory(cls, data, area=Rect((0, 0), (0, 0))):
         try: area = area._sfIntRect
         except AttributeError: _arg_error('area', 'Rect')
-        result = _sf.sfTexture_createFromMemory(data, len(data), area)
+        data, size = _memory_buffer(data)
+        result = _sf.sfTexture_createFromMemory(data, size, area)
         if not result: raise IOError("Could not create Texture from memory")
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
+
+    @classmethod
+    def from_mmap(cls, filename, offset=0, length=None, area=Rect((0, 0), (0, 0))):
+        return cls.from_memory(_map_file(filename, offset, length), area)
 
     #@classmethod
     #def from_stream(cls, stream, area):
@@ -529,27 +761,54 @@ class Texture(base.SFMLClass, _window.GlResource):
         except AttributeError: _arg_error('area', 'Rect')
         result = _sf.sfTexture_createFromImage(image, area)
         if not result: raise IOError("Could not create Texture from Image")
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
 
     def copy(self):
         result = _sf.sfTexture_copy(self._sfTexture)
-        return self._wrap_ptr(result)
-
-    def __del__(self):
-        if self._sf_owned: _sf.sfTexture_destroy(self._sfTexture)
+        return self._wrap_ptr(result, owned=True)
 
     def get_size(self):
         result = _sf.sfTexture_getSize(self._sfTexture)
         return _system.Vector2(result.x, result.y)
     size = property(get_size)
 
+    def _sf_size(self):
+        result = _sf.sfTexture_getSize(self._sfTexture)
+        return result.x*result.y*4
+
     def copy_to_image(self):
         result = _sf.sfTexture_copyToImage(self._sfTexture)
-        return Image._wrap_ptr(result)
+        return Image._wrap_ptr(result, owned=True)
     to_image = copy_to_image
 
-    def update_from_pixels(self, pixels, position=Rect((0, 0), (0, 0))):
-        return _sf.sfTexture_updateFromPixels(self._sfTexture, pixels, position.width, position.height, position.x, position.y)
+    # Uploads a contiguous buffer of RGBA pixels (bytes, bytearray, NumPy
+    # array, cdata array...) without copying it, to the whole texture or to
+    # the area `rect` (a Rect or (left, top, width, height))
+    def update(self, buffer, rect=None):
+        if rect is None:
+            size = _sf.sfTexture_getSize(self._sfTexture)
+            x, y, width, height = 0, 0, size.x, size.y
+        else:
+            try: x, y, width, height = rect.left, rect.top, rect.width, rect.height
+            except AttributeError: x, y, width, height = rect
+            x, y, width, height = int(x), int(y), int(width), int(height)
+        if isinstance(buffer, _ffi.CData):
+            if _ffi.typeof(buffer).kind!='array':
+                raise TypeError("The size of a cdata pointer is unknown, pass ffi.buffer(pointer, size) instead")
+            pixels, size = buffer, _ffi.sizeof(buffer)
+        else:
+            pixels = _ffi.from_buffer('sfUint8[]', buffer)
+            size = len(pixels)
+        if size<width*height*4:
+            raise ValueError("Buffer of {} bytes is too small for {}x{} RGBA pixels".format(size, width, height))
+        _sf.sfTexture_updateFromPixels(self._sfTexture, pixels, width, height, x, y)
+
+    def update_from_pixels(self, pixels, position=(0, 0)):
+        x, y = _system.Vector2(position)
+        data = pixels.data
+        if isinstance(data, _ffi.CData) and _ffi.typeof(data).kind=='pointer':
+            data = _ffi.buffer(data, int(pixels.width)*int(pixels.height)*4)
+        return self.update(data, (x, y, pixels.width, pixels.height))
 
     def update_from_image(self, image, position):
         position = _system.Vector2(position)
@@ -592,6 +851,9 @@ class Texture(base.SFMLClass, _window.GlResource):
 
 
 class Shader(base.SFMLClass, _window.GlResource):
+    # Textures set as parameters, by name, kept alive as long as it uses them
+    __slots__ = ('_textures',)
+    _sf_destroy = _sf.sfShader_destroy
     @classmethod
     def from_file(cls, vertex_filename, fragment_filename):
         try: vertex_filename = vertex_filename.encode()
@@ -600,13 +862,13 @@ class Shader(base.SFMLClass, _window.GlResource):
         except AttributeError: pass
         result = _sf.sfShader_createFromFile(vertex_filename, fragment_filename)
         if not result: raise IOError("Could not create Shader from files {!r}, {!r}".format(vertex_filename, fragment_filename))
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
     
     @classmethod
     def from_memory(cls, vertex_shader, fragment_shader):
         result = _sf.sfShader_createFromMemory(vertex_shader, fragment_shader)
         if not result: raise IOError("Could not create Shader from memory")
-        return cls._wrap_ptr(result)
+        return cls._wrap_ptr(result, owned=True)
     
     #@classmethod
     #def from_stream(cls, vertex_shader_stream, fragment_shader_stream):
@@ -617,9 +879,6 @@ class Shader(base.SFMLClass, _window.GlResource):
         #result = _sf.sfShader_createFromStream(vertex_shader_stream, fragment_shader_stream)
         #return cls._wrap_ptr(result)
     
-    def __del__(self):
-        if self._sf_owned: _sf.sfShader_destroy(self._sfShader)
-    
     def set_float_parameter(self, name, x):
         return _sf.sfShader_setFloatParameter(self._sfShader, name, x)
     set_1float_parameter = set_float_parameter
@@ -640,17 +899,18 @@ class Shader(base.SFMLClass, _window.GlResource):
         except AttributeError: _arg_error('vector', 'Vector3\1')
         return _sf.sfShader_setVector3Parameter(self._sfShader, name, vector)
     def set_color_parameter(self, name, color):
-        try: color = color._sfColor[0]
-        except AttributeError: _arg_error('color', 'Color')
+        color = _to_color(color)
         return _sf.sfShader_setColorParameter(self._sfShader, name, color)
     def set_transform_parameter(self, name, transform):
         try: transform = transform._sfTransform[0]
         except AttributeError: _arg_error('transform', 'Transform')
         return _sf.sfShader_setTransformParameter(self._sfShader, name, transform)
     def set_texture_parameter(self, name, texture):
-        try: texture = texture._sfTexture
+        try: sf_texture = texture._sfTexture
         except AttributeError: _arg_error('texture', 'Texture')
-        return _sf.sfShader_setTextureParameter(self._sfShader, name, texture)
+        try: self._textures[name] = texture
+        except AttributeError: self._textures = {name: texture}
+        return _sf.sfShader_setTextureParameter(self._sfShader, name, sf_texture)
     def set_current_texture_parameter(self, name):
         return _sf.sfShader_setCurrentTextureParameter(self._sfShader, name)
     set_currenttexturetype_parameter = set_current_texture_parameter
@@ -832,9 +1092,11 @@ class Shader(base.SFMLClass, _window.GlResource):
     
 
 class RenderTarget(object):
-    pass
+    __slots__ = ()
 
 class RenderStates(base.SFMLStruct):
+    # The texture and shader set, kept alive as long as the states use them
+    __slots__ = ('_texture', '_shader')
     def __init__(self, blend_mode=BlendMode.ALPHA, transform=Transform(), texture=None, shader=None):
         self._sfRenderStates = _ffi.new('sfRenderStates*')
         self.blend_mode = blend_mode
@@ -861,17 +1123,33 @@ class RenderStates(base.SFMLStruct):
 
     @property
     def texture(self):
-        return Texture._wrap_ptr(self._sfRenderStates.texture)
+        try: return self._texture
+        except AttributeError: pass
+        result = self._sfRenderStates.texture
+        return Texture._wrap_ptr(result) if result else None
     @texture.setter
     def texture(self, value):
-        self._sfRenderStates.texture = value._sfTexture
+        if value is None:
+            self._sfRenderStates.texture = _ffi.NULL
+        else:
+            try: self._sfRenderStates.texture = value._sfTexture
+            except AttributeError: _arg_error('texture', 'Texture')
+        self._texture = value
 
     @property
     def shader(self):
-        return Shader._wrap_ptr(self._sfRenderStates.shader)
+        try: return self._shader
+        except AttributeError: pass
+        result = self._sfRenderStates.shader
+        return Shader._wrap_ptr(result) if result else None
     @shader.setter
     def shader(self, value):
-        self._sfRenderStates.shader = value._sfShader
+        if value is None:
+            self._sfRenderStates.shader = _ffi.NULL
+        else:
+            try: self._sfRenderStates.shader = value._sfShader
+            except AttributeError: _arg_error('shader', 'Shader')
+        self._shader = value
 
     def __repr__(self):
         return self._repr('blend_mode= transform= texture= shader=')
@@ -879,13 +1157,15 @@ class RenderStates(base.SFMLStruct):
 
 class RenderWindow(_window.Window, RenderTarget):
     _sf_type = 'sfRenderWindow'
+    _sf_destroy = _sf.sfRenderWindow_destroy
     def __init__(self, mode, title, style=_window.Style.DEFAULT, settings=_window.ContextSettings(), **kwargs):
         try: mode = mode._sfVideoMode[0]
         except AttributeError: _arg_error('mode', 'VideoMode')
-        title = [ord(c) for c in title]+[0]
+        title = _encode_utf32(title)
         try: settings = settings._sfContextSettings
         except AttributeError: _arg_error('settings', 'ContextSettings')
         self._sfRenderWindow = _sf.sfRenderWindow_createUnicode(mode, title, style, settings)
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
     @classmethod
@@ -893,10 +1173,7 @@ class RenderWindow(_window.Window, RenderTarget):
         try: settings = settings._sfContextSettings
         except AttributeError: _arg_error('settings', 'ContextSettings')
         result = _sf.sfRenderWindow_createFromHandle(handle, settings)
-        return cls._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfRenderWindow_destroy(self._sfRenderWindow)
+        return cls._wrap_ptr(result, owned=True)
     
     def close(self):
         return _sf.sfRenderWindow_close(self._sfRenderWindow)
@@ -953,7 +1230,7 @@ class RenderWindow(_window.Window, RenderTarget):
         self.size = (self.size.x, value)
 
     def set_title(self, title):
-        title = [ord(c) for c in title]+[0]
+        title = _encode_utf32(title)
         return _sf.sfRenderWindow_setUnicodeTitle(self._sfRenderWindow, title)
     title = property(fset=set_title)
 
@@ -1001,8 +1278,7 @@ class RenderWindow(_window.Window, RenderTarget):
     system_handle = property(get_system_handle)
 
     def clear(self, color=Color.BLACK):
-        try: color = color._sfColor[0]
-        except AttributeError: _arg_error('color', 'Color')
+        color = _to_color(color)
         return _sf.sfRenderWindow_clear(self._sfRenderWindow, color)
     
     def get_view(self):
@@ -1041,8 +1317,19 @@ class RenderWindow(_window.Window, RenderTarget):
         return _system.Vector2(result.x, result.y)
     convert_coords = map_coords_to_pixel #TODO
 
-    def draw(self, drawable, states=RenderStates()):
-        drawable.draw(self, states.copy())
+    def draw(self, drawable, states=None):
+        try: func, target_attr, attr, python = _draw_functions[type(self), type(drawable)]
+        except KeyError: func, target_attr, attr, python = _draw_function(type(self), type(drawable))
+        if python:
+            # Drawables implemented in Python may modify the states they get
+            drawable.draw(self, RenderStates() if states is None else states.copy())
+            return
+        if states is None:
+            states = _ffi.NULL
+        else:
+            try: states = states._sfRenderStates
+            except AttributeError: _arg_error('states', 'RenderStates')
+        func(getattr(self, target_attr), getattr(drawable, attr), states)
 
     #def draw_sprite(self, object, states):
         #try: object = object._sfSprite
@@ -1093,12 +1380,14 @@ class RenderWindow(_window.Window, RenderTarget):
         #except AttributeError: _arg_error('states', 'RenderStates')
         #return _sf.sfRenderWindow_drawVertexArray(self._sfRenderWindow, object, states)
     
-    #def draw_primitives(self, vertices, vertex_count, type, states):
-        #try: vertices = vertices._sfVertex
-        #except AttributeError: _arg_error('vertices', 'Vertex')
-        #try: states = states._sfRenderStates
-        #except AttributeError: _arg_error('states', 'RenderStates')
-        #return _sf.sfRenderWindow_drawPrimitives(self._sfRenderWindow, vertices, vertex_count, type, states)
+    def draw_primitives(self, vertices, primitive_type, states=None):
+        vertices, vertex_count = _vertices(vertices)
+        if states is None:
+            states = _ffi.NULL
+        else:
+            try: states = states._sfRenderStates
+            except AttributeError: _arg_error('states', 'RenderStates')
+        _sf.sfRenderWindow_drawPrimitives(self._sfRenderWindow, vertices, vertex_count, primitive_type, states)
     
     def push_gl_states(self):
         return _sf.sfRenderWindow_pushGLStates(self._sfRenderWindow)
@@ -1114,7 +1403,7 @@ class RenderWindow(_window.Window, RenderTarget):
     
     def capture(self):
         result = _sf.sfRenderWindow_capture(self._sfRenderWindow)
-        return Image._wrap_ptr(result)
+        return Image._wrap_ptr(result, owned=True)
     
 
 
@@ -1124,28 +1413,42 @@ class Text(Drawable, Transformable):
     ITALIC = _sf.sfTextItalic
     UNDERLINED = _sf.sfTextUnderlined
 
+    # `_font` is the font set, kept alive as long as the text uses it
+    __slots__ = ('_string', '_font')
     _sf_type = 'sfText'
+    _sf_destroy = _sf.sfText_destroy
     def __init__(self, string='', font=None, character_size=30):
         self._sfText = _sf.sfText_create()
         self._sfTransformable = self._sfText
+        self._sf_manage()
         if string: self.string = string
         if font: self.font = font
         self.character_size = character_size
 
+    # The last string set is kept, so that setting it again (as labels updated
+    # every frame do) neither re-encodes it nor makes CSFML lay it out again
     def get_string(self):
-        return _sf.sfText_getUnicodeString(self._sfText) #TODO
+        try: return self._string
+        except AttributeError: pass
+        return _decode_utf32(_sf.sfText_getUnicodeString(self._sfText))
     def set_string(self, string):
-        string = [ord(c) for c in string]+[0]
-        return _sf.sfText_setUnicodeString(self._sfText, string)
+        try:
+            if self._string==string: return
+        except AttributeError: pass
+        _sf.sfText_setUnicodeString(self._sfText, _encode_utf32(string))
+        self._string = string
     string = property(get_string, set_string)
 
     def get_font(self):
+        try: return self._font
+        except AttributeError: pass
         result = _sf.sfText_getFont(self._sfText)
         return Font._wrap_ptr(result)
     def set_font(self, font):
-        try: font = font._sfFont
+        try: sf_font = font._sfFont
         except AttributeError: _arg_error('font', 'Font')
-        return _sf.sfText_setFont(self._sfText, font)
+        self._font = font
+        return _sf.sfText_setFont(self._sfText, sf_font)
     font = property(get_font, set_font)
     
     def get_character_size(self):
@@ -1164,8 +1467,7 @@ class Text(Drawable, Transformable):
         result = _sf.sfText_getColor(self._sfText)
         return Color._wrap_data(result)
     def set_color(self, color):
-        try: color = color._sfColor[0]
-        except AttributeError: _arg_error('color', 'Color')
+        color = _to_color(color)
         return _sf.sfText_setColor(self._sfText, color)
     color = property(get_color, set_color)
 
@@ -1179,35 +1481,33 @@ class Text(Drawable, Transformable):
     local_bounds = property(get_local_bounds)
 
     def get_global_bounds(self):
-        result = _sf.sfTExt_getGlobalBounds(self._sfText)
+        result = _sf.sfText_getGlobalBounds(self._sfText)
         return Rect((result.left, result.top), (result.width, result.height))
     global_bounds = property(get_global_bounds)
 
-    def draw(self, target, states):
-        try: starget = getattr(target, '_'+target._sf_type)
-        except AttributeError: _arg_error('target', 'RenderTarget')
-        try: states = states._sfRenderStates
-        except AttributeError: _arg_error('states', 'RenderStates')
-        return getattr(_sf, target._sf_type+'_drawText')(starget, self._sfText, states)
+    draw = _native_draw
 
 
 
     
 
-class VertexArray(base.SFMLClass):
+class VertexArray(Drawable, base.SFMLClass):
+    _sf_type = 'sfVertexArray'
+    _sf_destroy = _sf.sfVertexArray_destroy
     def __init__(self, **kwargs):
         self._sfVertexArray = _sf.sfVertexArray_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
     def copy(self):
         result = _sf.sfVertexArray_copy(self._sfVertexArray)
-        return self._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfVertexArray_destroy(self._sfVertexArray)
+        return self._wrap_ptr(result, owned=True)
     
     def get_vertex_count(self):
         return _sf.sfVertexArray_getVertexCount(self._sfVertexArray)
+
+    def _sf_size(self):
+        return _sf.sfVertexArray_getVertexCount(self._sfVertexArray)*_ffi.sizeof('sfVertex')
     
     def get_vertex(self, index):
         result = _sf.sfVertexArray_getVertex(self._sfVertexArray, index)
@@ -1223,6 +1523,34 @@ class VertexArray(base.SFMLClass):
         try: vertex = vertex._sfVertex[0]
         except AttributeError: _arg_error('vertex', 'Vertex')
         return _sf.sfVertexArray_append(self._sfVertexArray, vertex)
+
+    # Appends all the vertices of a buffer laid out as sfVertex (see
+    # vertex_dtype) or of a sequence of Vertex, with one copy
+    def extend(self, vertices):
+        self.set_range(_sf.sfVertexArray_getVertexCount(self._sfVertexArray), vertices)
+
+    # Overwrites the vertices starting at `start`, growing the array if needed
+    def set_range(self, start, vertices):
+        vertices, count = _vertices(vertices)
+        total = _sf.sfVertexArray_getVertexCount(self._sfVertexArray)
+        if not 0<=start<=total:
+            raise IndexError("start {} is out of range for {} vertices".format(start, total))
+        if start+count>total:
+            _sf.sfVertexArray_resize(self._sfVertexArray, start+count)
+        if count:
+            dest = _sf.sfVertexArray_getVertex(self._sfVertexArray, start)
+            _ffi.memmove(dest, vertices, count*_ffi.sizeof('sfVertex'))
+
+    # A writable memoryview of the vertices, modifiable in place. It keeps the
+    # array alive, but becomes invalid once it is resized, cleared or appended to.
+    def get_buffer(self):
+        count = _sf.sfVertexArray_getVertexCount(self._sfVertexArray)
+        if not count:
+            return memoryview(bytearray())
+        first = _sf.sfVertexArray_getVertex(self._sfVertexArray, 0)
+        first = _ffi.gc(first, lambda _, vertex_array=self: None)
+        return memoryview(_ffi.buffer(first, count*_ffi.sizeof('sfVertex')))
+    buffer = property(get_buffer)
     
     def set_primitive_type(self, type):
         return _sf.sfVertexArray_setPrimitiveType(self._sfVertexArray, type)
@@ -1234,8 +1562,11 @@ class VertexArray(base.SFMLClass):
         result = _sf.sfVertexArray_getBounds(self._sfVertexArray)
         return Rect((result.left, result.top), (result.width, result.height))
 
+    draw = _native_draw
+
 
 class View(base.SFMLClass):
+    _sf_destroy = _sf.sfView_destroy
     def __init__(self, rectangle=None, **kwargs):
         if rectangle is None:
             self._sfView = _sf.sfView_create()
@@ -1243,14 +1574,12 @@ class View(base.SFMLClass):
             try: rectangle = rectangle._sfFloatRect[0]
             except AttributeError: _arg_error('rectangle', 'Rect')
             self._sfView = _sf.sfView_createFromRect(rectangle)
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
     def copy(self):
         result = _sf.sfView_copy(self._sfView)
-        return self._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfView_destroy(self._sfView)
+        return self._wrap_ptr(result, owned=True)
     
     def get_center(self):
         result = _sf.sfView_getCenter(self._sfView)
@@ -1321,7 +1650,7 @@ class Glyph(base.SFMLStruct):
         return Rect((result.left, result.top), (result.width, result.height))
     @bounds.setter
     def bounds(self, value):
-        self._sfGlyph.bounds = value._sfIntRect
+        self._sfGlyph.bounds = value._sfIntRect[0]
     
     @property
     def texture_rect(self):
@@ -1329,7 +1658,7 @@ class Glyph(base.SFMLStruct):
         return Rect((result.left, result.top), (result.width, result.height))
     @texture_rect.setter
     def texture_rect(self, value):
-        self._sfGlyph.textureRect = value._sfIntRect
+        self._sfGlyph.textureRect = value._sfIntRect[0]
     texture_rectangle = texture_rect
     
     def __repr__(self):
@@ -1339,6 +1668,34 @@ class Glyph(base.SFMLStruct):
 
 
 
+# Any buffer laid out as an array of sfVertex (2 float32 position, 4 uint8
+# color, 2 float32 texture coordinates) can be passed where vertices are
+# expected, without copying; vertex_dtype() describes it for NumPy
+def vertex_dtype():
+    import numpy
+    return numpy.dtype([('position', 'f4', 2), ('color', 'u1', 4), ('tex_coords', 'f4', 2)])
+
+# -> (sfVertex*, count) for a buffer, a sequence of Vertex, a cdata array or
+# a (cdata pointer, count) pair
+def _vertices(vertices):
+    if isinstance(vertices, tuple) and len(vertices)==2 and isinstance(vertices[0], _ffi.CData):
+        return vertices
+    if isinstance(vertices, _ffi.CData):
+        if _ffi.typeof(vertices).kind!='array':
+            raise TypeError("The length of a cdata pointer is unknown, pass a (pointer, count) pair instead")
+        return vertices, len(vertices)
+    try:
+        size = memoryview(vertices).nbytes
+    except TypeError:
+        try: vertices = [vertex._sfVertex[0] for vertex in vertices]
+        except AttributeError: _arg_error('vertices', 'buffer or sequence of Vertex')
+        return _ffi.new('sfVertex[]', vertices), len(vertices)
+    if size%_ffi.sizeof('sfVertex'):
+        raise ValueError("Buffer size {} is not a multiple of the size of sfVertex".format(size))
+    vertices = _ffi.from_buffer('sfVertex[]', vertices)
+    return vertices, len(vertices)
+
+
 class Vertex(base.SFMLStruct):
     def __init__(self, position, color, tex_coords):
         self._sfVertex = _ffi.new('sfVertex*')
@@ -1352,8 +1709,7 @@ class Vertex(base.SFMLStruct):
         return _system.Vector2(result.x, result.y)
     @position.setter
     def position(self, value):
-        value = sf.Vector2(value)._sfVector2f
-        self._sfVertex.position = value
+        self._sfVertex.position = _system.Vector2(value)._sfVector2f[0]
     
     @property
     def color(self):
@@ -1361,18 +1717,16 @@ class Vertex(base.SFMLStruct):
         return Color._wrap_data(result)
     @color.setter
     def color(self, value):
-        try: value = value._sfColor
-        except AttributeError: _arg_error('value', 'Color')
-        self._sfVertex.color = value._sfColor
+        value = _to_color(value, 'value')
+        self._sfVertex.color = value
     
     @property
     def tex_coords(self):
-        result = self._sfVertex.tex_coords
+        result = self._sfVertex.texCoords
         return _system.Vector2(result.x, result.y)
     @tex_coords.setter
     def tex_coords(self, value):
-        value = sf.Vector2(value)._sfVector2f
-        self._sfVertex.texCoords = value
+        self._sfVertex.texCoords = _system.Vector2(value)._sfVector2f[0]
     
     def __repr__(self):
         return self._repr('position= color= tex_coords=')
@@ -1381,6 +1735,8 @@ class Vertex(base.SFMLStruct):
 
 
 from .graphics_shapes import *
+from .graphics_batch import *
+from .graphics_atlas import *
 
 
 
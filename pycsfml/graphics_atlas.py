@@ -0,0 +1,174 @@
+# PyCSFML - Python bindings for SFML
+# Copyright (c) 2014, Oleh Prypin <blaxpirit@gmail.com>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty. In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+
+
+
+from __future__ import division, absolute_import, print_function
+
+import os as _os
+import json as _json
+
+from .util import arg_error as _arg_error
+from .util import Rect
+from .graphics import Color, Image, Texture
+
+
+class _Page(object):
+    def __init__(self, width, height, image=None):
+        self.width, self.height = width, height
+        self.image = image or Image.from_color(width, height, Color(0, 0, 0, 0))
+        self.texture = None
+        # [top, height, used width]
+        self.shelves = []
+        # (image, x, y) not uploaded to the texture yet
+        self.pending = []
+
+    # Shelf packing: the shelf wasting the least height that still has room,
+    # else a new shelf below the last one. -> (x, y) or None
+    def place(self, width, height):
+        best = None
+        for shelf in self.shelves:
+            top, shelf_height, used = shelf
+            if height<=shelf_height and used+width<=self.width:
+                if best is None or shelf_height<best[1]:
+                    best = shelf
+        if best is None:
+            top = self.shelves[-1][0]+self.shelves[-1][1] if self.shelves else 0
+            if top+height>self.height or width>self.width:
+                return None
+            best = [top, height, 0]
+            self.shelves.append(best)
+        x, y = best[2], best[0]
+        best[2] += width
+        return x, y
+
+    def get_texture(self):
+        if self.texture is None:
+            self.texture = Texture.from_image(self.image)
+        else:
+            for image, x, y in self.pending:
+                self.texture.update_from_image(image, (x, y))
+        self.pending = []
+        return self.texture
+
+
+class TextureAtlas(object):
+    # Packs many images into a few large textures ("pages"), so that sprites
+    # using them can share a texture and be batched.
+    # Images can be added at any time; the textures are created or updated
+    # when next requested. save() writes the layout and the page images, and
+    # load() restores them without packing again.
+    def __init__(self, page_size=2048, padding=1):
+        maximum = Texture.get_maximum_size()
+        try: width, height = page_size
+        except TypeError: width = height = page_size
+        self.page_width, self.page_height = min(width, maximum), min(height, maximum)
+        self.padding = padding
+        self._pages = []
+        # name -> (page index, Rect)
+        self._regions = {}
+
+    def __len__(self):
+        return len(self._regions)
+    def __contains__(self, name):
+        return name in self._regions
+    def __iter__(self):
+        return iter(self._regions)
+
+    @property
+    def page_count(self):
+        return len(self._pages)
+
+    def add(self, name, image):
+        try: image._sfImage
+        except AttributeError: _arg_error('image', 'Image')
+        if name in self._regions:
+            raise KeyError("{!r} is already in the atlas".format(name))
+        width, height = image.size
+        padded = width+self.padding, height+self.padding
+        for index, page in enumerate(self._pages):
+            position = page.place(*padded)
+            if position is not None:
+                break
+        else:
+            page = _Page(self.page_width, self.page_height)
+            position = page.place(*padded)
+            if position is None:
+                raise ValueError("Image {!r} of size {}x{} doesn't fit in a {}x{} page".format(
+                    name, width, height, self.page_width, self.page_height))
+            self._pages.append(page)
+            index = len(self._pages)-1
+        x, y = position
+        page.image.copy_image(image, (x, y))
+        if page.texture is not None:
+            page.pending.append((image, x, y))
+        rect = Rect((x, y), (width, height))
+        self._regions[name] = (index, rect)
+        return rect
+
+    def add_file(self, name, filename):
+        return self.add(name, Image.from_file(filename))
+
+    # -> (Texture, Rect) for `Sprite(texture, rectangle)`
+    def get(self, name):
+        index, rect = self._regions[name]
+        return self._pages[index].get_texture(), rect
+    __getitem__ = get
+
+    def get_rect(self, name):
+        return self._regions[name][1]
+
+    def get_texture(self, index=0):
+        return self._pages[index].get_texture()
+
+    def save(self, filename):
+        base, _ = _os.path.splitext(filename)
+        pages = []
+        for index, page in enumerate(self._pages):
+            page_filename = '{}-{}.png'.format(base, index)
+            if not page.image.save_to_file(page_filename):
+                raise IOError("Could not save atlas page {!r}".format(page_filename))
+            pages.append({'file': _os.path.basename(page_filename), 'shelves': page.shelves})
+        layout = {
+            'page_size': [self.page_width, self.page_height],
+            'padding': self.padding,
+            'pages': pages,
+            'regions': {
+                name: [index, rect.left, rect.top, rect.width, rect.height]
+                for name, (index, rect) in self._regions.items()
+            },
+        }
+        with open(filename, 'w') as f:
+            _json.dump(layout, f, indent=1, sort_keys=True)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename) as f:
+            layout = _json.load(f)
+        self = cls(layout['page_size'], layout['padding'])
+        directory = _os.path.dirname(filename)
+        for data in layout['pages']:
+            image = Image.from_file(_os.path.join(directory, data['file']))
+            width, height = image.size
+            page = _Page(width, height, image)
+            page.shelves = [list(shelf) for shelf in data['shelves']]
+            self._pages.append(page)
+        for name, (index, left, top, width, height) in layout['regions'].items():
+            self._regions[name] = (index, Rect((left, top), (width, height)))
+        return self
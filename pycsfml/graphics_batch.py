@@ -0,0 +1,380 @@
+# PyCSFML - Python bindings for SFML
+# Copyright (c) 2014, Oleh Prypin <blaxpirit@gmail.com>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty. In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+
+
+
+from __future__ import division, absolute_import, print_function
+
+import math as _math
+import struct as _struct
+
+from .ffi import ffi as _ffi
+from .graphics import _sf
+
+from .util import arg_error as _arg_error, Rect
+from .graphics import Drawable, BlendMode, PrimitiveType, RenderStates, VertexArray, _to_color
+
+
+# One sfQuads quad: 4 x sfVertex {sfVector2f position; sfColor color; sfVector2f texCoords}
+_quad = _struct.Struct('='+'2f4B2f'*4)
+_vertex_size = _quad.size//4
+_identity = (1, 0, 0, 0, 1, 0, 0, 0, 1)
+
+def _color_tuple(color):
+    return _to_color(color)
+
+def _rect_tuple(rect):
+    try: return rect.left, rect.top, rect.width, rect.height
+    except AttributeError: return tuple(rect)
+
+# (target class) -> <target>_drawPrimitives
+_primitives_functions = {}
+
+def _draw_primitives(target, vertices, vertex_count, primitive_type, states):
+    target_cls = type(target)
+    try: func = _primitives_functions[target_cls]
+    except KeyError:
+        try: func = getattr(_sf, target_cls._sf_type+'_drawPrimitives')
+        except AttributeError: _arg_error('target', 'RenderTarget')
+        _primitives_functions[target_cls] = func
+    func(getattr(target, target_cls._sf_attr), vertices, vertex_count, primitive_type, states)
+
+
+class SpriteBatch(Drawable):
+    # Collects sprites and draws all of those sharing a texture, blend mode and
+    # shader with one drawPrimitives call.
+    # With ordered=False sprites are grouped by state, the groups being drawn
+    # in the order of their first sprite. With ordered=True the submission
+    # order is kept exactly and only consecutive sprites are merged.
+    def __init__(self, ordered=False):
+        self.ordered = ordered
+        self.clear()
+
+    def clear(self):
+        # [key, texture, shader, bytearray of quads, set of the wrappers that
+        # keep the texture and shader alive until the batch is cleared]
+        self._batches = []
+        self._by_key = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _batch(self, texture, blend_mode, shader):
+        key = (texture, blend_mode, shader)
+        if self.ordered:
+            if self._batches and self._batches[-1][0]==key:
+                return self._batches[-1]
+        else:
+            try: return self._by_key[key]
+            except KeyError: pass
+        batch = [key, texture, shader, bytearray(), set()]
+        self._batches.append(batch)
+        self._by_key[key] = batch
+        return batch
+
+    def _add_quad(self, buf, matrix, rect, color):
+        a, b, c, d, e, f = matrix[0], matrix[1], matrix[2], matrix[3], matrix[4], matrix[5]
+        left, top, width, height = rect
+        w, h = abs(width), abs(height)
+        right, bottom = left+width, top+height
+        cr, cg, cb, ca = color
+        buf += _quad.pack(
+            c, f, cr, cg, cb, ca, left, top,
+            a*w+c, d*w+f, cr, cg, cb, ca, right, top,
+            a*w+b*h+c, d*w+e*h+f, cr, cg, cb, ca, right, bottom,
+            b*h+c, e*h+f, cr, cg, cb, ca, left, bottom,
+        )
+        self._count += 1
+
+    # Adds the current state of a Sprite
+    def add_sprite(self, sprite, blend_mode=BlendMode.ALPHA, shader=None):
+        try: sf_sprite = sprite._sfSprite
+        except AttributeError: _arg_error('sprite', 'Sprite')
+        texture = _sf.sfSprite_getTexture(sf_sprite)
+        batch = self._batch(texture, blend_mode, shader._sfShader if shader is not None else _ffi.NULL)
+        # The texture wrapper set on the sprite, or the sprite itself
+        batch[4].add(getattr(sprite, '_texture', sprite))
+        if shader is not None: batch[4].add(shader)
+        rect = _sf.sfSprite_getTextureRect(sf_sprite)
+        color = _sf.sfSprite_getColor(sf_sprite)
+        transform = _sf.sfSprite_getTransform(sf_sprite)
+        self._add_quad(
+            batch[3], transform.matrix,
+            (rect.left, rect.top, rect.width, rect.height),
+            (color.r, color.g, color.b, color.a)
+        )
+
+    # Adds a lightweight sprite record without creating a Sprite: the
+    # transform is computed the same way as Transformable does
+    def add(self, texture, position, texture_rect=None, color=(255, 255, 255, 255),
+            origin=(0, 0), scale=(1, 1), rotation=0, blend_mode=BlendMode.ALPHA, shader=None):
+        try: sf_texture = texture._sfTexture
+        except AttributeError: _arg_error('texture', 'Texture')
+        batch = self._batch(sf_texture, blend_mode, shader._sfShader if shader is not None else _ffi.NULL)
+        batch[4].add(texture)
+        if shader is not None: batch[4].add(shader)
+        if texture_rect is None:
+            size = _sf.sfTexture_getSize(sf_texture)
+            texture_rect = (0, 0, size.x, size.y)
+        else:
+            texture_rect = _rect_tuple(texture_rect)
+        x, y = position
+        ox, oy = origin
+        sx, sy = scale
+        if rotation:
+            angle = -rotation*_math.pi/180
+            cosine, sine = _math.cos(angle), _math.sin(angle)
+        else:
+            cosine, sine = 1.0, 0.0
+        sxc, syc, sxs, sys = sx*cosine, sy*cosine, sx*sine, sy*sine
+        matrix = (
+            sxc, sys, -ox*sxc-oy*sys+x,
+            -sxs, syc, ox*sxs-oy*syc+y,
+        )
+        self._add_quad(batch[3], matrix, texture_rect, _color_tuple(color))
+
+    # Adds records of the form (texture, position[, texture_rect[, color]])
+    def extend(self, records):
+        for record in records:
+            self.add(*record)
+
+    def draw(self, target, states=None):
+        sf_states = _ffi.new('sfRenderStates*')
+        if states is not None:
+            sf_states.transform = states._sfRenderStates.transform
+        else:
+            sf_states.transform.matrix = _identity
+        for key, texture, shader, buf, _ in self._batches:
+            if not buf:
+                continue
+            sf_states.blendMode = key[1]
+            sf_states.texture = texture
+            sf_states.shader = shader
+            vertices = _ffi.from_buffer('sfVertex[]', buf)
+            _draw_primitives(target, vertices, len(buf)//_vertex_size, PrimitiveType.QUADS, sf_states)
+
+
+class StaticLayer(Drawable):
+    # A tile map compiled into one VertexArray per chunk of tiles. Only the
+    # chunks whose tiles changed are rebuilt, and only the chunks intersecting
+    # the target's view, mapped back through the transform of `states`, are
+    # drawn.
+    # `tiles` is a sequence of rows of tile ids, numbered left to right and top
+    # to bottom in the tileset texture; None or a negative id is an empty cell.
+    def __init__(self, texture, tile_size, tiles, chunk_size=(16, 16)):
+        try: sf_texture = texture._sfTexture
+        except AttributeError: _arg_error('texture', 'Texture')
+        self.texture = texture
+        self.tile_width, self.tile_height = tile_size
+        self.chunk_width, self.chunk_height = chunk_size
+        size = _sf.sfTexture_getSize(sf_texture)
+        if not 0<self.tile_width<=size.x or not 0<self.tile_height<=size.y:
+            raise ValueError("Tile size {!r} does not fit in the {}x{} texture".format(tuple(tile_size), size.x, size.y))
+        self._columns = size.x//self.tile_width
+        self._tiles = [list(row) for row in tiles]
+        self.height = len(self._tiles)
+        self.width = max(len(row) for row in self._tiles) if self._tiles else 0
+        for row in self._tiles:
+            row.extend([None]*(self.width-len(row)))
+        self._chunks = {}
+        self._dirty = set(
+            (cx, cy)
+            for cy in range((self.height+self.chunk_height-1)//self.chunk_height)
+            for cx in range((self.width+self.chunk_width-1)//self.chunk_width)
+        )
+
+    def get_tile(self, x, y):
+        return self._tiles[y][x]
+    def set_tile(self, x, y, tile):
+        if not (0<=x<self.width and 0<=y<self.height):
+            raise IndexError("Tile {!r} is outside of the {}x{} layer".format((x, y), self.width, self.height))
+        if self._tiles[y][x]!=tile:
+            self._tiles[y][x] = tile
+            self._dirty.add((x//self.chunk_width, y//self.chunk_height))
+
+    def __getitem__(self, pos):
+        return self.get_tile(*pos)
+    def __setitem__(self, pos, tile):
+        x, y = pos
+        self.set_tile(x, y, tile)
+
+    def _build(self, cx, cy):
+        tw, th = self.tile_width, self.tile_height
+        columns = self._columns
+        buf = bytearray()
+        for y in range(cy*self.chunk_height, min((cy+1)*self.chunk_height, self.height)):
+            row = self._tiles[y]
+            top, bottom = y*th, (y+1)*th
+            for x in range(cx*self.chunk_width, min((cx+1)*self.chunk_width, self.width)):
+                tile = row[x]
+                if tile is None or tile<0:
+                    continue
+                left, right = x*tw, (x+1)*tw
+                u, v = (tile%columns)*tw, (tile//columns)*th
+                buf += _quad.pack(
+                    left, top, 255, 255, 255, 255, u, v,
+                    right, top, 255, 255, 255, 255, u+tw, v,
+                    right, bottom, 255, 255, 255, 255, u+tw, v+th,
+                    left, bottom, 255, 255, 255, 255, u, v+th,
+                )
+        if not buf:
+            self._chunks.pop((cx, cy), None)
+            return
+        try: va = self._chunks[cx, cy]
+        except KeyError:
+            va = self._chunks[cx, cy] = VertexArray()
+            va.set_primitive_type(PrimitiveType.QUADS)
+        va.clear()
+        va.extend(buf)
+
+    def update(self):
+        for cx, cy in self._dirty:
+            self._build(cx, cy)
+        self._dirty.clear()
+
+    # -> (first chunk x, first chunk y, last chunk x, last chunk y) in view,
+    # for the layer drawn with `transform`; empty ranges if none is
+    def _visible(self, view, transform):
+        (x, y), (w, h) = view.center, view.size
+        angle = view.rotation*_math.pi/180
+        if angle:
+            cosine, sine = abs(_math.cos(angle)), abs(_math.sin(angle))
+            w, h = w*cosine+h*sine, w*sine+h*cosine
+        left, top, right, bottom = x-w/2, y-h/2, x+w/2, y+h/2
+        if transform.values!=_identity:
+            rect = transform.inverse.transform_rect(Rect((left, top), (w, h)))
+            left, top = rect.left, rect.top
+            right, bottom = left+rect.width, top+rect.height
+        cw, ch = self.chunk_width*self.tile_width, self.chunk_height*self.tile_height
+        return (
+            max(int(_math.floor(left/cw)), 0),
+            max(int(_math.floor(top/ch)), 0),
+            min(int(_math.floor(right/cw)), (self.width-1)//self.chunk_width),
+            min(int(_math.floor(bottom/ch)), (self.height-1)//self.chunk_height),
+        )
+
+    def draw(self, target, states=None):
+        if self._dirty:
+            self.update()
+        if states is None:
+            states = RenderStates(texture=self.texture)
+        else:
+            states = states.copy()
+            states.texture = self.texture
+        x0, y0, x1, y1 = self._visible(target.view, states.transform)
+        get = self._chunks.get
+        for cy in range(y0, y1+1):
+            for cx in range(x0, x1+1):
+                va = get((cx, cy))
+                if va is not None:
+                    target.draw(va, states)
+
+
+class TextBatch(Drawable):
+    # Draws many strings of one font, size and style with a single
+    # drawPrimitives call, using the glyphs of the font's texture.
+    # add() returns a handle for set() and remove(); only the strings that
+    # changed are laid out again before the next draw.
+    def __init__(self, font, character_size=30, bold=False):
+        try: font._sfFont
+        except AttributeError: _arg_error('font', 'Font')
+        self.font = font
+        self.character_size = character_size
+        self.bold = bool(bold)
+        self.clear()
+
+    def clear(self):
+        # handle -> [string, (x, y), color, quads or None if out of date]
+        self._entries = {}
+        self._next = 0
+        self._buffer = bytearray()
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, string, position=(0, 0), color=(255, 255, 255, 255)):
+        handle = self._next
+        self._next += 1
+        self._entries[handle] = [string, tuple(position), _color_tuple(color), None]
+        self._dirty = True
+        return handle
+
+    def set(self, handle, string=None, position=None, color=None):
+        entry = self._entries[handle]
+        if string is not None and string!=entry[0]:
+            entry[0] = string
+            entry[3] = None
+        if position is not None and tuple(position)!=entry[1]:
+            entry[1] = tuple(position)
+            entry[3] = None
+        if color is not None:
+            color = _color_tuple(color)
+            if color!=entry[2]:
+                entry[2] = color
+                entry[3] = None
+        if entry[3] is None:
+            self._dirty = True
+
+    def remove(self, handle):
+        del self._entries[handle]
+        self._dirty = True
+
+    # Quads of one string, laid out like Text does
+    def _layout(self, string, position, color):
+        x0, y0 = position
+        cr, cg, cb, ca = color
+        quads = bytearray()
+        for left, top, width, height, (u, v, tw, th) in self.font._layout(string, self.character_size, self.bold)[0]:
+            left, top = x0+left, y0+top
+            right, bottom = left+width, top+height
+            quads += _quad.pack(
+                left, top, cr, cg, cb, ca, u, v,
+                right, top, cr, cg, cb, ca, u+tw, v,
+                right, bottom, cr, cg, cb, ca, u+tw, v+th,
+                left, bottom, cr, cg, cb, ca, u, v+th,
+            )
+        return bytes(quads)
+
+    def update(self):
+        for entry in self._entries.values():
+            if entry[3] is None:
+                entry[3] = self._layout(*entry[:3])
+        self._buffer = bytearray(b''.join(entry[3] for entry in self._entries.values()))
+        self._dirty = False
+
+    def draw(self, target, states=None):
+        if self._dirty:
+            self.update()
+        if not self._buffer:
+            return
+        sf_states = _ffi.new('sfRenderStates*')
+        if states is not None:
+            sf_states.transform = states._sfRenderStates.transform
+            sf_states.blendMode = states._sfRenderStates.blendMode
+            sf_states.shader = states._sfRenderStates.shader
+        else:
+            sf_states.transform.matrix = _identity
+            sf_states.blendMode = BlendMode.ALPHA
+        # The glyphs are rendered in the texture when they are laid out, so it
+        # is only fetched afterwards
+        sf_states.texture = _sf.sfFont_getTexture(self.font._sfFont, self.character_size)
+        vertices = _ffi.from_buffer('sfVertex[]', self._buffer)
+        _draw_primitives(target, vertices, len(vertices), PrimitiveType.QUADS, sf_states)
@@ -27,12 +27,22 @@ from . import system as _system
 
 from . import base
 from .util import arg_error as _arg_error
-from .graphics import Drawable, Transformable
+from .graphics import Color, Rect, Texture, Drawable, Transformable, _native_draw, _to_color
 
 
 
 class Shape(Drawable, Transformable):
+    # The texture set, kept alive as long as the shape uses it
+    __slots__ = ('_texture', '_get_point_count_callback', '_get_point_callback')
     _sf_type = 'sfShape'
+    _sf_destroy = _sf.sfShape_destroy
+    _sf_aliases = ('_sfShape', '_sfTransformable')
+    _sf_functions = Transformable._sf_functions + (
+        'getTexture', 'setTexture', 'getTextureRect', 'setTextureRect',
+        'getFillColor', 'setFillColor', 'getOutlineColor', 'setOutlineColor',
+        'getOutlineThickness', 'setOutlineThickness',
+        'getPointCount', 'getPoint', 'getLocalBounds', 'getGlobalBounds',
+    )
     def __init__(self, **kwargs):
         get_point_count = lambda _: self.get_point_count()
         self._get_point_count_callback = _ffi.callback('unsigned int(void*)', get_point_count)
@@ -42,69 +52,80 @@ class Shape(Drawable, Transformable):
 
         self._sfShape = _sf.sfShape_create(self._get_point_count_callback, self._get_point_callback, _ffi.NULL)
         self._sfTransformable = self._sfShape
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
 
+    @classmethod
+    def _wrap_ptr(cls, sf_ptr, owned=False):
+        self = super(Shape, cls)._wrap_ptr(sf_ptr, owned)
+        self._sfShape = sf_ptr
+        return self
+
     def get_texture(self):
-        result = getattr(_sf, self._sf_type+'_getTexture')(self._sfShape)
-        return Texture._wrap_ptr(result)
+        try: return self._texture
+        except AttributeError: pass
+        result = self._sf_getTexture(self._sfShape)
+        return Texture._wrap_ptr(result) if result else None
     def set_texture(self, texture, reset_rect):
-        try: texture = texture._sfTexture
-        except AttributeError: _arg_error('texture', 'Texture')
-        return getattr(_sf, self._sf_type+'_setTexture')(self._sfShape, texture, reset_rect)
+        if texture is None:
+            sf_texture = _ffi.NULL
+        else:
+            try: sf_texture = texture._sfTexture
+            except AttributeError: _arg_error('texture', 'Texture')
+        self._texture = texture
+        return self._sf_setTexture(self._sfShape, sf_texture, reset_rect)
     texture = property(get_texture, set_texture)
 
     def get_texture_rect(self):
-        result = getattr(_sf, self._sf_type+'_getTextureRect')(self._sfShape)
+        result = self._sf_getTextureRect(self._sfShape)
         return Rect((result.left, result.top), (result.width, result.height))
     def set_texture_rect(self, rect):
         try: rect = rect._sfIntRect[0]
         except AttributeError: _arg_error('rect', 'Rect')
-        return getattr(_sf, self._sf_type+'_setTextureRect')(self._sfShape, rect)
+        return self._sf_setTextureRect(self._sfShape, rect)
     texture_rect = texture_rectangle = property(get_texture_rect, set_texture_rect)
 
     def get_fill_color(self):
-        result = getattr(_sf, self._sf_type+'_getFillColor')(self._sfShape)
+        result = self._sf_getFillColor(self._sfShape)
         return Color._wrap_data(result)
     def set_fill_color(self, color):
-        try: color = color._sfColor[0]
-        except AttributeError: _arg_error('color', 'Color')
-        return getattr(_sf, self._sf_type+'_setFillColor')(self._sfShape, color)
+        color = _to_color(color)
+        return self._sf_setFillColor(self._sfShape, color)
     fill_color = property(get_fill_color, set_fill_color)
 
     def get_outline_color(self):
-        result = getattr(_sf, self._sf_type+'_getOutlineColor')(self._sfShape)
+        result = self._sf_getOutlineColor(self._sfShape)
         return Color._wrap_data(result)
     def set_outline_color(self, color):
-        try: color = color._sfColor[0]
-        except AttributeError: _arg_error('color', 'Color')
-        return getattr(_sf, self._sf_type+'_setOutlineColor')(self._sfShape, color)
+        color = _to_color(color)
+        return self._sf_setOutlineColor(self._sfShape, color)
     outline_color = property(get_outline_color, set_outline_color)
 
     def get_outline_thickness(self):
-        return getattr(_sf, self._sf_type+'_getOutlineThickness')(self._sfShape)
+        return self._sf_getOutlineThickness(self._sfShape)
     def set_outline_thickness(self, thickness):
-        return getattr(_sf, self._sf_type+'_setOutlineThickness')(self._sfShape, thickness)
+        return self._sf_setOutlineThickness(self._sfShape, thickness)
     outline_thickness = property(get_outline_thickness, set_outline_thickness)
 
 
 
     def get_point_count(self):
-        return getattr(_sf, self._sf_type+'_getPointCount')(self._sfShape)
+        return self._sf_getPointCount(self._sfShape)
     @property
     def point_count(self):
         return self.get_point_count()
 
     def get_point(self, index):
-        result = getattr(_sf, self._sf_type+'_getPoint')(self._sfShape, index)
+        result = self._sf_getPoint(self._sfShape, index)
         return _system.Vector2(result.x, result.y)
 
     def get_local_bounds(self):
-        result = getattr(_sf, self._sf_type+'_getLocalBounds')(self._sfShape)
+        result = self._sf_getLocalBounds(self._sfShape)
         return Rect((result.left, result.top), (result.width, result.height))
     local_bounds = property(get_local_bounds)
 
     def get_global_bounds(self):
-        result = getattr(_sf, self._sf_type+'_getGlobalBounds')(self._sfShape)
+        result = self._sf_getGlobalBounds(self._sfShape)
         return Rect((result.left, result.top), (result.width, result.height))
     global_bounds = property(get_global_bounds)
 
@@ -112,21 +133,18 @@ class Shape(Drawable, Transformable):
         return _sf.sfShape_update(self._sfShape)
 
 
-    def draw(self, target, states):
-        try: starget = getattr(target, '_'+target._sf_type)
-        except AttributeError: _arg_error('target', 'RenderTarget')
-        try: states = states._sfRenderStates
-        except AttributeError: _arg_error('states', 'RenderStates')
-        return getattr(_sf, target._sf_type+'_draw'+self._sf_type[2:])(starget, self._sfShape, states)
+    draw = _native_draw
 
 
 
 
 class CircleShape(Shape):
     _sf_type = 'sfCircleShape'
+    _sf_destroy = _sf.sfCircleShape_destroy
     def __init__(self, radius=0, point_count=30, **kwargs):
         self._sfCircleShape = _sf.sfCircleShape_create()
         self._sfTransformable = self._sfShape = self._sfCircleShape
+        self._sf_manage()
         self.radius = radius
         self.point_count = point_count
         if kwargs: self._set(**kwargs)
@@ -144,9 +162,11 @@ class CircleShape(Shape):
 
 class RectangleShape(Shape):
     _sf_type = 'sfRectangleShape'
+    _sf_destroy = _sf.sfRectangleShape_destroy
     def __init__(self, size=(0, 0), **kwargs):
         self._sfRectangleShape = _sf.sfRectangleShape_create()
         self._sfTransformable = self._sfShape = self._sfRectangleShape
+        self._sf_manage()
         self.size = size
         if kwargs: self._set(**kwargs)
 
@@ -161,9 +181,11 @@ class RectangleShape(Shape):
 
 class ConvexShape(Shape):
     _sf_type = 'sfConvexShape'
+    _sf_destroy = _sf.sfConvexShape_destroy
     def __init__(self, **kwargs):
         self._sfConvexShape = _sf.sfConvexShape_create()
         self._sfTransformable = self._sfShape = self._sfConvexShape
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
 
     def get_point_count(self):
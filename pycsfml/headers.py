@@ -0,0 +1,167 @@
+# PyCSFML - Python bindings for SFML
+# Copyright (c) 2014, Oleh Prypin <blaxpirit@gmail.com>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty. In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+
+
+from __future__ import division, absolute_import, print_function
+
+import os
+import os.path
+import re
+import json
+import hashlib
+import tempfile
+
+
+inc_path = '/usr/include'
+
+# Preprocessed header text is cached here, keyed by the headers' stat info and
+# the CSFML version. Set PYCSFML_CACHE_DIR to an empty string to disable.
+cache_dir = os.environ.get('PYCSFML_CACHE_DIR')
+if cache_dir is None:
+    cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'pycsfml')
+
+# Bump this whenever `visit_header` starts producing different output
+cache_format = 2
+
+
+preamble = '''
+typedef unsigned long sfWindowHandle;
+typedef int size_t;
+typedef int wchar_t;
+'''
+
+def visit_header(file_path, src, visited):
+    if file_path in visited:
+        return
+    visited.add(file_path)
+    with open(os.path.join(inc_path, file_path)) as src_file:
+        #src.append('\n\n;;;;enum {};;;;\n\n'.format(file_path[:-2].replace('/', '_')))
+        for line in src_file:
+            if '//' in line:
+                line = line.split('//')[0]
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('#include'):
+                m = re.match(r'#include <(SFML/.+\.h)>', line)
+                if m and not m.group(1).endswith('Export.h'):
+                    visit_header(m.group(1), src, visited)
+            if line.startswith('#') or line.startswith('//'):
+                continue
+            if '__int64' in line or 'HWND__' in line:
+                continue
+            if line.startswith('typedef') and line.rstrip(';').endswith('sfWindowHandle'):
+                continue
+            if '_API' in line:
+                line = re.sub(r'CSFML_[A-Z]+_API ?', '', line)
+            line = line.replace('(void)', '()')
+            if '<<' in line:
+                line = re.sub(r'1 *<< *([0-9]+)', lambda m: str(1<<int(m.group(1))), line)
+            line = line.replace('sfTitlebar | sfResize | sfClose', '7')
+            src.append(line)
+    src.append('\n')
+
+
+module_names = ['system', 'window', 'graphics', 'audio', 'network']
+
+# Subsystems whose headers each subsystem's headers include (transitively)
+dependencies = {
+    'system': [],
+    'window': ['system'],
+    'graphics': ['system', 'window'],
+    'audio': ['system'],
+    'network': ['system'],
+}
+
+
+def csfml_version():
+    version = []
+    with open(os.path.join(inc_path, 'SFML/Config.h')) as config_file:
+        for line in config_file:
+            m = re.match(r'#define CSFML_VERSION_[A-Z]+ +([0-9]+)', line.strip())
+            if m:
+                version.append(m.group(1))
+    return '.'.join(version)
+
+def _header_stamps(file_paths):
+    stamps = {}
+    for file_path in file_paths:
+        st = os.stat(os.path.join(inc_path, file_path))
+        stamps[file_path] = [st.st_mtime, st.st_size]
+    return stamps
+
+def _cache_file(name, exclude, preamble):
+    key = '{}|{}|{}|{}|{}'.format(cache_format, inc_path, name, ','.join(sorted(exclude)), preamble)
+    return os.path.join(cache_dir, 'cdef-{}-{}.json'.format(name, hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]))
+
+def _load_cached(name, exclude, preamble, version):
+    try:
+        with open(_cache_file(name, exclude, preamble)) as cache_file:
+            cached = json.load(cache_file)
+        if cached['version']!=version:
+            return None
+        if _header_stamps(cached['headers'])!=cached['headers']:
+            return None
+        return cached['src'], set(cached['headers'])
+    except (EnvironmentError, ValueError, KeyError, TypeError):
+        return None
+
+def _store_cached(name, exclude, preamble, version, src, visited):
+    cached = {'version': version, 'headers': _header_stamps(visited), 'src': src}
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.cdef-')
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(cached, cache_file)
+        try:
+            os.replace(tmp_path, _cache_file(name, exclude, preamble))
+        except AttributeError:
+            os.rename(tmp_path, _cache_file(name, exclude, preamble))
+    except EnvironmentError:
+        pass
+
+
+# Returns the cdef source of one subsystem's headers and the set of header paths
+# it consists of. Headers in `exclude` (normally those already declared for the
+# subsystem's dependencies) are skipped.
+def get_source(name, exclude=(), preamble=''):
+    version = csfml_version()
+    if cache_dir:
+        cached = _load_cached(name, exclude, preamble, version)
+        if cached is not None:
+            return cached
+
+    src = [preamble]
+    visited = set(exclude)
+    visit_header('SFML/{}.h'.format(name.capitalize()), src, visited)
+    src = '\n'.join(src)
+    visited.difference_update(exclude)
+
+    if cache_dir:
+        _store_cached(name, exclude, preamble, version, src, visited)
+    return src, visited
+
+def get_full_source(names=module_names, preamble=preamble):
+    src, declared = [], set()
+    for name in names:
+        part, headers = get_source(name, declared, preamble if not src else '')
+        src.append(part)
+        declared |= headers
+    return '\n'.join(src)
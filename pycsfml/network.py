@@ -20,8 +20,8 @@
 
 from __future__ import division, absolute_import, print_function
 
-from .ffi import ffi as _ffi
-_sf = _ffi.dlopen('libcsfml-network.so')
+from .ffi import ffi as _ffi, load as _load
+_sf = _load('network')
 
 from . import base
 from .util import arg_error as _arg_error
@@ -77,9 +77,7 @@ class IpAddress(base.SFMLStruct):
     
 
 class FtpDirectoryResponse(base.SFMLClass):
-    def __del__(self):
-        if self._sf_owned: _sf.sfFtpDirectoryResponse_destroy(self._sfFtpDirectoryResponse)
-    
+    _sf_destroy = _sf.sfFtpDirectoryResponse_destroy
     def is_ok(self):
         return _sf.sfFtpDirectoryResponse_isOk(self._sfFtpDirectoryResponse)
     
@@ -94,9 +92,7 @@ class FtpDirectoryResponse(base.SFMLClass):
     
 
 class FtpListingResponse(base.SFMLClass):
-    def __del__(self):
-        if self._sf_owned: _sf.sfFtpListingResponse_destroy(self._sfFtpListingResponse)
-    
+    _sf_destroy = _sf.sfFtpListingResponse_destroy
     def is_ok(self):
         return _sf.sfFtpListingResponse_isOk(self._sfFtpListingResponse)
     
@@ -114,9 +110,7 @@ class FtpListingResponse(base.SFMLClass):
     
 
 class FtpResponse(base.SFMLClass):
-    def __del__(self):
-        if self._sf_owned: _sf.sfFtpResponse_destroy(self._sfFtpResponse)
-    
+    _sf_destroy = _sf.sfFtpResponse_destroy
     def is_ok(self):
         return _sf.sfFtpResponse_isOk(self._sfFtpResponse)
     
@@ -128,89 +122,87 @@ class FtpResponse(base.SFMLClass):
     
 
 class Ftp(base.SFMLClass):
+    _sf_destroy = _sf.sfFtp_destroy
     def __init__(self, **kwargs):
         self._sfFtp = _sf.sfFtp_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
-    def __del__(self):
-        if self._sf_owned: _sf.sfFtp_destroy(self._sfFtp)
-    
     def connect(self, server, port, timeout):
         try: server = server._sfIpAddress[0]
         except AttributeError: _arg_error('server', 'IpAddress')
         try: timeout = timeout._sfTime[0]
         except AttributeError: _arg_error('timeout', 'Time')
         result = _sf.sfFtp_connect(self._sfFtp, server, port, timeout)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def login_anonymous(self):
         result = _sf.sfFtp_loginAnonymous(self._sfFtp)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def login(self, user_name, password):
         result = _sf.sfFtp_login(self._sfFtp, user_name, password)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def disconnect(self):
         result = _sf.sfFtp_disconnect(self._sfFtp)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def keep_alive(self):
         result = _sf.sfFtp_keepAlive(self._sfFtp)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def get_working_directory(self):
         result = _sf.sfFtp_getWorkingDirectory(self._sfFtp)
-        return FtpDirectoryResponse._wrap_ptr(result)
+        return FtpDirectoryResponse._wrap_ptr(result, owned=True)
     
     def get_directory_listing(self, directory):
         result = _sf.sfFtp_getDirectoryListing(self._sfFtp, directory)
-        return FtpListingResponse._wrap_ptr(result)
+        return FtpListingResponse._wrap_ptr(result, owned=True)
     
     def change_directory(self, directory):
         result = _sf.sfFtp_changeDirectory(self._sfFtp, directory)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def parent_directory(self):
         result = _sf.sfFtp_parentDirectory(self._sfFtp)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     @classmethod
     def directory(cls, ftp, name):
         try: ftp = ftp._sfFtp
         except AttributeError: _arg_error('ftp', 'Ftp')
         result = _sf.sfFtp_createDirectory(ftp, name)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def delete_directory(self, name):
         result = _sf.sfFtp_deleteDirectory(self._sfFtp, name)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def rename_file(self, file, new_name):
         result = _sf.sfFtp_renameFile(self._sfFtp, file, new_name)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def delete_file(self, name):
         result = _sf.sfFtp_deleteFile(self._sfFtp, name)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def download(self, distant_file, dest_path, mode):
         result = _sf.sfFtp_download(self._sfFtp, distant_file, dest_path, mode)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
     def upload(self, local_file, dest_path, mode):
         result = _sf.sfFtp_upload(self._sfFtp, local_file, dest_path, mode)
-        return FtpResponse._wrap_ptr(result)
+        return FtpResponse._wrap_ptr(result, owned=True)
     
 
 class HttpRequest(base.SFMLClass):
+    _sf_destroy = _sf.sfHttpRequest_destroy
     def __init__(self, **kwargs):
         self._sfHttpRequest = _sf.sfHttpRequest_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
-    def __del__(self):
-        if self._sf_owned: _sf.sfHttpRequest_destroy(self._sfHttpRequest)
-    
     def set_field(self, field, value):
         return _sf.sfHttpRequest_setField(self._sfHttpRequest, field, value)
     
@@ -228,9 +220,7 @@ class HttpRequest(base.SFMLClass):
     
 
 class HttpResponse(base.SFMLClass):
-    def __del__(self):
-        if self._sf_owned: _sf.sfHttpResponse_destroy(self._sfHttpResponse)
-    
+    _sf_destroy = _sf.sfHttpResponse_destroy
     def get_field(self, field):
         return _sf.sfHttpResponse_getField(self._sfHttpResponse, field)
     
@@ -248,13 +238,12 @@ class HttpResponse(base.SFMLClass):
     
 
 class Http(base.SFMLClass):
+    _sf_destroy = _sf.sfHttp_destroy
     def __init__(self, **kwargs):
         self._sfHttp = _sf.sfHttp_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
-    def __del__(self):
-        if self._sf_owned: _sf.sfHttp_destroy(self._sfHttp)
-    
     def set_host(self, host, port):
         return _sf.sfHttp_setHost(self._sfHttp, host, port)
     
@@ -264,20 +253,19 @@ class Http(base.SFMLClass):
         try: timeout = timeout._sfTime[0]
         except AttributeError: _arg_error('timeout', 'Time')
         result = _sf.sfHttp_sendRequest(self._sfHttp, request, timeout)
-        return HttpResponse._wrap_ptr(result)
+        return HttpResponse._wrap_ptr(result, owned=True)
     
 
 class Packet(base.SFMLClass):
+    _sf_destroy = _sf.sfPacket_destroy
     def __init__(self, **kwargs):
         self._sfPacket = _sf.sfPacket_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
     def copy(self):
         result = _sf.sfPacket_copy(self._sfPacket)
-        return self._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfPacket_destroy(self._sfPacket)
+        return self._wrap_ptr(result, owned=True)
     
     def append(self, data, size_in_bytes):
         return _sf.sfPacket_append(self._sfPacket, data, size_in_bytes)
@@ -365,16 +353,15 @@ class Packet(base.SFMLClass):
     
 
 class SocketSelector(base.SFMLClass):
+    _sf_destroy = _sf.sfSocketSelector_destroy
     def __init__(self, **kwargs):
         self._sfSocketSelector = _sf.sfSocketSelector_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
     def copy(self):
         result = _sf.sfSocketSelector_copy(self._sfSocketSelector)
-        return self._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfSocketSelector_destroy(self._sfSocketSelector)
+        return self._wrap_ptr(result, owned=True)
     
     def add_tcp_listener(self, socket):
         try: socket = socket._sfTcpListener
@@ -431,13 +418,12 @@ class SocketSelector(base.SFMLClass):
     
 
 class TcpListener(base.SFMLClass):
+    _sf_destroy = _sf.sfTcpListener_destroy
     def __init__(self, **kwargs):
         self._sfTcpListener = _sf.sfTcpListener_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
-    def __del__(self):
-        if self._sf_owned: _sf.sfTcpListener_destroy(self._sfTcpListener)
-    
     def set_blocking(self, blocking):
         return _sf.sfTcpListener_setBlocking(self._sfTcpListener, blocking)
     
@@ -457,13 +443,12 @@ class TcpListener(base.SFMLClass):
     
 
 class TcpSocket(base.SFMLClass):
+    _sf_destroy = _sf.sfTcpSocket_destroy
     def __init__(self, **kwargs):
         self._sfTcpSocket = _sf.sfTcpSocket_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
-    def __del__(self):
-        if self._sf_owned: _sf.sfTcpSocket_destroy(self._sfTcpSocket)
-    
     def set_blocking(self, blocking):
         return _sf.sfTcpSocket_setBlocking(self._sfTcpSocket, blocking)
     
@@ -508,13 +493,12 @@ class TcpSocket(base.SFMLClass):
     
 
 class UdpSocket(base.SFMLClass):
+    _sf_destroy = _sf.sfUdpSocket_destroy
     def __init__(self, **kwargs):
         self._sfUdpSocket = _sf.sfUdpSocket_create()
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
     
-    def __del__(self):
-        if self._sf_owned: _sf.sfUdpSocket_destroy(self._sfUdpSocket)
-    
     def set_blocking(self, blocking):
         return _sf.sfUdpSocket_setBlocking(self._sfUdpSocket, blocking)
     
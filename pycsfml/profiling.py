@@ -0,0 +1,175 @@
+# PyCSFML - Python bindings for SFML
+# Copyright (c) 2014, Oleh Prypin <blaxpirit@gmail.com>
+#
+# This software is provided 'as-is', without any express or implied
+# warranty. In no event will the authors be held liable for any damages
+# arising from the use of this software.
+#
+# Permission is granted to anyone to use this software for any purpose,
+# including commercial applications, and to alter it and redistribute it
+# freely, subject to the following restrictions:
+#
+# 1. The origin of this software must not be misrepresented; you must not
+#    claim that you wrote the original software. If you use this software
+#    in a product, an acknowledgment in the product documentation would be
+#    appreciated but is not required.
+# 2. Altered source versions must be plainly marked as such, and must not be
+#    misrepresented as being the original software.
+# 3. This notice may not be removed or altered from any source distribution.
+
+
+
+from __future__ import division, absolute_import, print_function
+
+import sys as _sys
+from timeit import default_timer as _timer
+
+from . import ffi as _ffi_module
+
+__all__ = ['enable', 'disable', 'enabled', 'reset', 'frame', 'stats', 'report']
+
+
+# Opt-in instrumentation of the CSFML libraries: while enabled, every `_sf`
+# object of the pycsfml modules is replaced by a proxy that counts the calls
+# and wall time of each C function. Set PYCSFML_PROFILE=1 (or call `enable()`
+# before importing the modules) to also cover the calls made at import time.
+# Native objects created before `enable()` are still destroyed uninstrumented.
+
+# name -> [calls, seconds]
+_stats = {}
+_frames = [0]
+# id(lib) -> proxy, so that modules sharing a library share the proxy
+_proxies = {}
+
+
+class ProfiledLib(object):
+    def __init__(self, lib):
+        self._lib = lib
+
+    def __getattr__(self, name):
+        attr = getattr(self._lib, name)
+        if callable(attr):
+            attr = _instrument(name, attr)
+        # Cache on the instance so that __getattr__ runs once per name
+        setattr(self, name, attr)
+        return attr
+
+    def __dir__(self):
+        return dir(self._lib)
+
+def _instrument(name, func):
+    entry = _stats.setdefault(name, [0, 0.0])
+    def wrapper(*args):
+        start = _timer()
+        try:
+            return func(*args)
+        finally:
+            entry[1] += _timer()-start
+            entry[0] += 1
+    wrapper.__name__ = str(name)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+def _wrap(lib):
+    if isinstance(lib, ProfiledLib):
+        return lib
+    try:
+        return _proxies[id(lib)]
+    except KeyError:
+        proxy = _proxies[id(lib)] = ProfiledLib(lib)
+        return proxy
+
+def _modules():
+    prefix = __name__.rpartition('.')[0]+'.'
+    for name, module in list(_sys.modules.items()):
+        if name.startswith(prefix) and module is not None and '_sf' in vars(module):
+            yield module
+
+
+# Name of a C function taken from `lib`
+def _name(func, lib):
+    try: return func.__name__ # instrumented, or from the compiled module
+    except AttributeError: pass
+    if isinstance(lib, ProfiledLib):
+        lib = lib._lib
+    # Libraries loaded with dlopen keep the functions used so far as attributes
+    for name, value in vars(lib).items():
+        if value is func:
+            return name
+
+# Takes the C functions the modules keep outside of `_sf` again from the
+# current `_sf` of their module: the functions bound by each wrapper class
+# and its `_sf_destroy`, and the draw function tables filled on use
+def _rebind():
+    from . import base
+    for module in _modules():
+        for table in ('_draw_functions', '_primitives_functions'):
+            if table in vars(module):
+                vars(module)[table].clear()
+    classes = [base.SFMLClass]
+    seen = set()
+    while classes:
+        cls = classes.pop()
+        if cls in seen:
+            continue
+        seen.add(cls)
+        classes.extend(cls.__subclasses__())
+        if '_sf_type' in vars(cls):
+            cls._sf_bind()
+        destroy = vars(cls).get('_sf_destroy')
+        lib = getattr(_sys.modules.get(cls.__module__), '_sf', None)
+        if destroy is not None and lib is not None:
+            name = _name(destroy, lib)
+            if name is not None:
+                cls._sf_destroy = getattr(lib, name)
+
+def enable():
+    _ffi_module._wrap_lib = _wrap
+    for module in _modules():
+        module._sf = _wrap(module._sf)
+    _rebind()
+
+def disable():
+    _ffi_module._wrap_lib = None
+    for module in _modules():
+        if isinstance(module._sf, ProfiledLib):
+            module._sf = module._sf._lib
+    _rebind()
+    _proxies.clear()
+
+def enabled():
+    return _ffi_module._wrap_lib is not None
+
+def reset():
+    for entry in _stats.values():
+        entry[:] = [0, 0.0]
+    _frames[0] = 0
+
+# Marks the end of a frame. If it is never called, each `*_display` call
+# counts as one.
+def frame():
+    _frames[0] += 1
+
+def frame_count():
+    if _frames[0]:
+        return _frames[0]
+    return sum(calls for name, (calls, _) in _stats.items() if name.endswith('_display'))
+
+# [(name, calls, seconds)], most expensive first
+def stats(top=None):
+    result = [(name, calls, seconds) for name, (calls, seconds) in _stats.items() if calls]
+    result.sort(key=lambda item: item[2], reverse=True)
+    return result[:top] if top else result
+
+def report(top=20, file=None):
+    file = file or _sys.stdout
+    frames = frame_count()
+    rows = stats(top)
+    total = sum(seconds for _, _, seconds in stats())
+    print("{:<40} {:>10} {:>11} {:>10} {:>11}".format(
+        'function', 'calls', 'total ms', 'us/call', 'calls/frame'), file=file)
+    for name, calls, seconds in rows:
+        print("{:<40} {:>10} {:>11.3f} {:>10.2f} {:>11}".format(
+            name, calls, seconds*1000, seconds/calls*1e6,
+            '{:.1f}'.format(calls/frames) if frames else '-'), file=file)
+    print("{} functions, {:.3f} ms total over {} frames".format(len(stats()), total*1000, frames), file=file)
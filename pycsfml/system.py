@@ -20,8 +20,8 @@
 
 from __future__ import division, absolute_import, print_function
 
-from .ffi import ffi as _ffi
-_sf = _ffi.dlopen('libcsfml-system.so')
+from .ffi import ffi as _ffi, load as _load
+_sf = _load('system')
 
 from . import base
 from .util import arg_error as _arg_error
@@ -84,15 +84,14 @@ def microseconds(amount):
 
 
 class Clock(base.SFMLClass):
+    _sf_destroy = _sf.sfClock_destroy
     def __init__(self):
         self._sfClock = _sf.sfClock_create()
+        self._sf_manage()
     
     def copy(self):
         result = _sf.sfClock_copy(self._sfClock)
-        return self._wrap_ptr(result)
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfClock_destroy(self._sfClock)
+        return self._wrap_ptr(result, owned=True)
     
     def get_elapsed_time(self):
         result = _sf.sfClock_getElapsedTime(self._sfClock)
@@ -105,11 +104,10 @@ class Clock(base.SFMLClass):
     
 
 class Mutex(base.SFMLClass):
+    _sf_destroy = _sf.sfMutex_destroy
     def __init__(self):
         self._sfMutex = _sf.sfMutex_create()
-    
-    def __del__(self):
-        if self._sf_owned: _sf.sfMutex_destroy(self._sfMutex)
+        self._sf_manage()
     
     def lock(self):
         _sf.sfMutex_lock(self._sfMutex)
@@ -134,14 +132,14 @@ class Lock(object):
 
 
 class Thread(base.SFMLClass):
+    __slots__ = ('_callback',)
+    _sf_destroy = _sf.sfThread_destroy
     def __init__(self, function, *args, **kwargs):
         callback = lambda _: function(*args, **kwargs)
         self._callback = callback = _ffi.callback('void(void*)', callback)
         self._sfThread = _sf.sfThread_create(callback, _ffi.NULL)
+        self._sf_manage()
 
-    def __del__(self):
-        if self._sf_owned: _sf.sfThread_destroy(self._sfThread)
-    
     def launch(self):
         _sf.sfThread_launch(self._sfThread)
     
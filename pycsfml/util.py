@@ -20,6 +20,10 @@
 
 from __future__ import division, absolute_import, print_function
 
+import os as _os
+import sys as _sys
+import mmap as _mmap
+
 from .ffi import ffi as _ffi
 
 
@@ -188,7 +192,7 @@ class Rect(object):
 
 class Pixels(object):
     def __init__(self, size, data):
-        self.size = _system.Vector2(size)
+        self.size = Vector2(size)
         self.data = data
 
     @property
@@ -206,6 +210,36 @@ class Pixels(object):
         self.size.y = value
 
 
+_utf32 = 'utf-32-le' if _sys.byteorder=='little' else 'utf-32-be'
+
+# -> NUL-terminated sfUint32[] holding the code points of `string`, encoded
+# by the codec in one go rather than one code point at a time
+def encode_utf32(string):
+    return _ffi.from_buffer('sfUint32[]', (string+'\0').encode(_utf32))
+
+# NUL-terminated sfUint32* -> str
+def decode_utf32(ptr):
+    if not ptr:
+        return ''
+    return _ffi.string(_ffi.cast('char32_t*', ptr))
+
+# -> (char[] cdata, size) pointing into any buffer (bytes, bytearray, mmap,
+# memoryview...) without copying it; the cdata keeps the buffer alive
+def memory_buffer(data):
+    data = _ffi.from_buffer(data)
+    return data, len(data)
+
+# Maps `length` bytes (the rest of the file if None) of a file starting at
+# `offset` read-only into memory, -> memoryview
+def map_file(filename, offset=0, length=None):
+    with open(filename, 'rb') as f:
+        if length is None:
+            length = _os.fstat(f.fileno()).st_size-offset
+        start = offset-offset%_mmap.ALLOCATIONGRANULARITY
+        mapped = _mmap.mmap(f.fileno(), offset-start+length, offset=start, access=_mmap.ACCESS_READ)
+    return memoryview(mapped)[offset-start:offset-start+length]
+
+
 class FakeCallableInt(int):
     def __call__(self):
         return int(self)
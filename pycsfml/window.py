@@ -20,13 +20,14 @@
 
 from __future__ import division, absolute_import, print_function
 
-from .ffi import ffi as _ffi
-_sf = _ffi.dlopen('libcsfml-window.so')
+from .ffi import ffi as _ffi, load as _load
+_sf = _load('window')
 
 from . import system as _system
 
 from . import base
 from .util import arg_error as _arg_error, FakeCallableInt as _FakeCallableInt
+from .util import encode_utf32 as _encode_utf32
 
 from itertools import islice as _islice
 from warnings import warn as _warn
@@ -92,17 +93,19 @@ class ContextSettings(base.SFMLStruct):
         return self._repr('depth_bits= stencil_bits= antialiasing_level= major_version= minor_version=')
 
 class GlResource(object):
-    pass
+    __slots__ = ()
 
 
 class Window(base.SFMLClass, GlResource):
+    _sf_destroy = _sf.sfWindow_destroy
     def __init__(self, mode, title, style=Style.DEFAULT, settings=ContextSettings(), **kwargs):
         try: mode = mode._sfVideoMode[0]
         except AttributeError: _arg_error('mode', 'VideoMode')
-        title = [ord(c) for c in title]+[0]
+        title = _encode_utf32(title)
         try: settings = settings._sfContextSettings
         except AttributeError: _arg_error('settings', 'ContextSettings')
         self._sfWindow = _sf.sfWindow_createUnicode(mode, title, style, settings)
+        self._sf_manage()
         if kwargs: self._set(**kwargs)
         self.on_create()
     
@@ -111,22 +114,22 @@ class Window(base.SFMLClass, GlResource):
         try: settings = settings._sfContextSettings
         except AttributeError: _arg_error('settings', 'ContextSettings')
         result = _sf.sfWindow_createFromHandle(handle, settings)
-        result = cls._wrap_ptr(result)
+        result = cls._wrap_ptr(result, owned=True)
         result.on_create()
         return result
     
     def create(self, *args, **kwargs):
-        self.__del__()
+        self.destroy()
         self.__init__(*args, **kwargs)
     recreate = create
     def create_from_handle(self, *args, **kwargs):
-        self.__del__()
-        self._sfWindow = self.from_handle(*args, **kwargs)._sfWindow
+        self.destroy()
+        other = self.from_handle(*args, **kwargs)
+        other._sf_disown()
+        setattr(self, self._sf_attr, getattr(other, other._sf_attr))
+        self._sf_manage()
     recreate_from_handle = create_from_handle
 
-    def __del__(self):
-        if self._sf_owned: _sf.sfWindow_destroy(self._sfWindow)
-    
     def close(self):
         _sf.sfWindow_close(self._sfWindow)
     
@@ -173,7 +176,7 @@ class Window(base.SFMLClass, GlResource):
     size = property(get_size, set_size)
 
     def set_title(self, title):
-        title = [ord(c) for c in title]+[0]
+        title = _encode_utf32(title)
         _sf.sfWindow_setUnicodeTitle(self._sfWindow, title)
     title = property(fset=set_title)
     
@@ -289,11 +292,10 @@ class VideoMode(base.SFMLStruct):
 
 
 class Context(base.SFMLClass, GlResource):
+    _sf_destroy = _sf.sfContext_destroy
     def __init__(self):
         self._sfContext = _sf.sfContext_create()
-
-    def __del__(self):
-        if self._sf_owned: _sf.sfContext_destroy(self._sfContext)
+        self._sf_manage()
 
     def set_active(self, active):
         _sf.sfContext_setActive(self._sfContext, active)
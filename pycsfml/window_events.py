@@ -72,7 +72,7 @@ class Event(object):
         event = object.__new__(event_cls)
         event._sf_event = sf_ptr
         sf_ptr = getattr(sf_ptr, event_cls._struct_member)
-        setattr(event, '_sf'+struct_cls.__name__, sf_ptr)
+        setattr(event, struct_cls._sf_attr, sf_ptr)
         return event
 
 class CloseEvent(Event):